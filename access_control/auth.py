@@ -1,13 +1,18 @@
 import os
+import time
+import hashlib
 from jose import jwt
-import bcrypt
-from typing import Optional
+from typing import Optional, Dict, Any
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 
-from database.session import get_data
+from core.config import Settings
+from core.cache import TTLCache
+from database.session import run_query, register_write_hook
+from database.async_session import async_get_by_key, async_run_query
 from database.db import Users, Roles, UserRoles
+from access_control.password import password_verifier, PasswordQueueFull
 
 SECRET_KEY = os.getenv("SECRET_KEY", "changeme")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
@@ -20,56 +25,116 @@ HR = "hr"
 ADMIN = "admin"
 LD = "ld"
 
+# Role of a user in one indexed round trip (see data/indexes.sql)
+ROLE_QUERY = f'''
+    SELECT r."{Roles.ROLE_NAME.value}" AS role_name
+    FROM "{UserRoles.USER_ROLE_DATABASE.value}"."{UserRoles.USER_ROLE_TABLE.value}" AS ur
+    JOIN "{Roles.ROLE_DATABASE.value}"."{Roles.ROLE_TABLE.value}" AS r
+      ON r."{Roles.ROLE_ID.value}" = ur."{UserRoles.ROLE_ID.value}"
+    WHERE ur."{UserRoles.USER_ID.value}" = :user_id
+    LIMIT 1
+'''
+ROLE_TABLES = [
+    (UserRoles.USER_ROLE_DATABASE.value, UserRoles.USER_ROLE_TABLE.value),
+    (Roles.ROLE_DATABASE.value, Roles.ROLE_TABLE.value),
+]
+
+# ====== VERIFIED TOKEN CACHE ======
+# Keyed by the token's sha256 so raw bearer tokens are never held as keys.
+# Entries are tagged with the user id and ROLES_TAG; a write to either role
+# table drops them all, invalidate_user_tokens() drops one user's.
+auth_settings = Settings().auth
+ROLES_TAG = "roles"
+_token_cache = TTLCache(
+    maxsize=auth_settings.TOKEN_CACHE_MAXSIZE,
+    ttl=auth_settings.TOKEN_CACHE_TTL
+)
+
 class User(BaseModel):
     user_id: str
     role: str
 
-def authenticate_user(username: str, password: str) -> Optional[User]:
+def get_user_role(user_id: str) -> Optional[str]:
     """
-    Authenticate user by username and password
+    Resolve the role name of a user with a single JOIN (served from the read cache when warm).
     """
-    users_data = get_data(Users.USER_DATABASE.value, Users.USER_TABLE.value)
-    if not users_data:
-        print("⚠️ Users table empty")
-        return None
+    rows = run_query(ROLE_QUERY, {"user_id": str(user_id)}, tables=ROLE_TABLES)
+    return rows[0]["role_name"] if rows else None
+
+
+async def get_user_role_async(user_id: str) -> Optional[str]:
+    rows = await async_run_query(ROLE_QUERY, {"user_id": str(user_id)}, tables=ROLE_TABLES)
+    return rows[0]["role_name"] if rows else None
+
 
-    user_row = next((u for u in users_data if u.get(Users.USERNAME.value) == username), None)
+async def authenticate_user_async(username: str, password: str) -> Optional[User]:
+    """
+    Authenticate user by username and password. bcrypt runs on the bounded password
+    verifier pool; when that pool is saturated the login is refused with 503.
+    """
+    user_row = await async_get_by_key(
+        Users.USER_DATABASE.value, Users.USER_TABLE.value, Users.USERNAME.value, username,
+        columns=[Users.USER_ID.value, Users.PASSWORD_HASH.value]
+    )
     if not user_row:
         print(f"⚠️ Username '{username}' not found")
         return None
 
-    if not bcrypt.checkpw(password.encode("utf-8"), user_row[Users.PASSWORD_HASH.value].encode("utf-8")):
+    try:
+        password_ok = await password_verifier.verify(password, user_row[Users.PASSWORD_HASH.value])
+    except PasswordQueueFull as e:
+        print(f"⚠️ Login rejected, password verifier saturated: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many concurrent logins, please retry",
+            headers={"Retry-After": "1"}
+        )
+    if not password_ok:
         print(f"⚠️ Incorrect password for username '{username}'")
         return None
 
-    # Lấy role
-    user_roles_data = get_data(UserRoles.USER_ROLE_DATABASE.value, UserRoles.USER_ROLE_TABLE.value)
-    roles_data = get_data(Roles.ROLE_DATABASE.value, Roles.ROLE_TABLE.value)
-    if not user_roles_data or not roles_data:
-        print(f"⚠️ Role tables empty")
-        return None
-
-    role_id = next(
-        (ur[UserRoles.ROLE_ID.value] for ur in user_roles_data if ur[UserRoles.USER_ID.value] == user_row[Users.USER_ID.value]),
-        None
-    )
-    if not role_id:
-        print(f"⚠️ No role assigned for user '{username}'")
-        return None
-
-    role_name = next((r[Roles.ROLE_NAME.value] for r in roles_data if r[Roles.ROLE_ID.value] == role_id), None)
+    role_name = await get_user_role_async(user_row[Users.USER_ID.value])
     if not role_name:
-        print(f"⚠️ Role ID '{role_id}' not found in roles table")
+        print(f"⚠️ No role assigned for user '{username}'")
         return None
 
     return User(user_id=str(user_row[Users.USER_ID.value]), role=role_name)
 
 
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def invalidate_user_tokens(user_id: Any) -> None:
+    """
+    Forget every verified token of a user, e.g. after changing their role.
+    """
+    _token_cache.invalidate_tag(("user", str(user_id)))
+
+
+def _invalidate_role_tokens(schema: str, table_name: str) -> None:
+    _token_cache.invalidate_tag(ROLES_TAG)
+
+
+for _schema, _table in ROLE_TABLES:
+    register_write_hook(_schema, _table, _invalidate_role_tokens)
+
+
+def get_token_cache_stats() -> Dict[str, Any]:
+    return _token_cache.stats()
+
+
 def get_current_user_token(token: str = Depends(oauth2_scheme)) -> User:
     """
     Decode the token and retrieve user information from PostgreSQL DB.
+    A token verified before is served from the token cache until its exp.
     Print detailed reasons for failure.
     """
+    digest = _token_digest(token)
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = str(payload.get("sub"))
@@ -83,26 +148,20 @@ def get_current_user_token(token: str = Depends(oauth2_scheme)) -> User:
         print(f"⚠️ JWT decode error: {e}")
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user_roles_data = get_data(UserRoles.USER_ROLE_DATABASE.value, UserRoles.USER_ROLE_TABLE.value)
-    roles_data = get_data(Roles.ROLE_DATABASE.value, Roles.ROLE_TABLE.value)
-    if not user_roles_data or not roles_data:
-        print(f"⚠️ Role tables empty or user roles missing for user_id {user_id}")
-        raise HTTPException(status_code=401, detail="User not found or no role assigned")
-
-    role_id = next(
-        (ur[UserRoles.ROLE_ID.value] for ur in user_roles_data if str(ur[UserRoles.USER_ID.value]) == user_id),
-        None
-    )
-    if not role_id:
+    tags = (ROLES_TAG, ("user", user_id))
+    snapshot = _token_cache.snapshot(tags)
+    role_name = get_user_role(user_id)
+    if not role_name:
         print(f"⚠️ No role assigned for user_id '{user_id}'")
         raise HTTPException(status_code=401, detail="User not found or no role assigned")
 
-    role_name = next((r[Roles.ROLE_NAME.value] for r in roles_data if r[Roles.ROLE_ID.value] == role_id), None)
-    if not role_name:
-        print(f"⚠️ Role ID '{role_id}' not found in roles table")
-        raise HTTPException(status_code=401, detail="User role not found")
-
-    return User(user_id=user_id, role=role_name)
+    user = User(user_id=user_id, role=role_name)
+    ttl = float(auth_settings.TOKEN_CACHE_TTL)
+    exp = payload.get("exp")
+    if exp is not None:
+        ttl = min(ttl, float(exp) - time.time())
+    _token_cache.set(digest, user, ttl=ttl, tags=tags, snapshot=snapshot)
+    return user
 
 
 def require_admin(user: User = Depends(get_current_user_token)):
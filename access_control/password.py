@@ -0,0 +1,122 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+import bcrypt
+from core.config import Settings
+
+auth_settings = Settings().auth
+
+THROUGHPUT_WINDOW = 60.0
+
+
+class PasswordQueueFull(Exception):
+    """Raised when too many password checks are already waiting for a bcrypt worker."""
+
+
+class PasswordVerifier:
+    """
+    Runs bcrypt checks on a dedicated, size-bounded thread pool so a login burst
+    cannot occupy the threads that serve every other endpoint.
+    Checks beyond `max_pending` (running + queued) are rejected immediately.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._accepted = 0
+        self._rejected = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._busy_seconds = 0.0
+        self._completed_at: deque = deque()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="bcrypt"
+                    )
+        return self._executor
+
+    def _check(self, password: str, password_hash: str) -> bool:
+        with self._lock:
+            self._active += 1
+        started = time.perf_counter()
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+        finally:
+            elapsed = time.perf_counter() - started
+            now = time.monotonic()
+            with self._lock:
+                self._active -= 1
+                self._busy_seconds += elapsed
+                self._completed_at.append(now)
+                while self._completed_at and self._completed_at[0] < now - THROUGHPUT_WINDOW:
+                    self._completed_at.popleft()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordQueueFull(f"{self._pending} password checks already pending")
+            self._pending += 1
+            self._accepted += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            ok = await loop.run_in_executor(self._get_executor(), self._check, password, password_hash)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        with self._lock:
+            if ok:
+                self._succeeded += 1
+            else:
+                self._failed += 1
+        return ok
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            while self._completed_at and self._completed_at[0] < now - THROUGHPUT_WINDOW:
+                self._completed_at.popleft()
+            completed = self._succeeded + self._failed
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "active": self._active,
+                "queue_depth": max(self._pending - self._active, 0),
+                "accepted": self._accepted,
+                "rejected": self._rejected,
+                "succeeded": self._succeeded,
+                "failed": self._failed,
+                "avg_check_ms": round(self._busy_seconds / completed * 1000, 2) if completed else 0.0,
+                "checks_per_sec": round(len(self._completed_at) / THROUGHPUT_WINDOW, 3),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_verifier = PasswordVerifier(
+    max_workers=auth_settings.BCRYPT_WORKERS,
+    max_pending=auth_settings.BCRYPT_MAX_PENDING
+)
+
+
+def get_login_stats() -> Dict[str, Any]:
+    return password_verifier.stats()
@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
 from jose import jwt
-from access_control.auth import authenticate_user
+from access_control.auth import authenticate_user_async, require_admin, User
 from access_control.auth import SECRET_KEY, ALGORITHM  
+from access_control.password import get_login_stats
 
 router = APIRouter()
 
@@ -16,8 +17,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 @router.post("/token")
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = authenticate_user(form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    user = await authenticate_user_async(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,3 +34,10 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
         "access_token": access_token,
         "token_type": "bearer"
     }
+
+@router.get("/login-stats")
+def login_stats(current_user: User = Depends(require_admin)):
+    """
+    Password verifier pool usage and login throughput.
+    """
+    return get_login_stats()
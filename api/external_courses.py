@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from schemas.external_courses_schema import ExternalCourseResponse, UserProfile
 from access_control.auth import require_admin, User
-from apps.external_courses.pipeline import main
 
 router = APIRouter()
 
 @router.get("/external-courses", response_model=ExternalCourseResponse)
 def fetch_external_courses(current_user: UserProfile = Depends(require_admin)):
+    # The ingestion stack (pymilvus schema helpers, Coursera scraper) is only
+    # needed by this admin endpoint, so it is not imported at worker startup.
+    from apps.external_courses.pipeline import main
+
     try:
         main()
         return ExternalCourseResponse(status="Courses fetched successfully")
@@ -2,8 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from schemas.feedback_schema import FeedBackResponse, InputFeedBack
 from access_control.auth import require_employee, User
 from apps.feedback.feedback import add_feedback
-from apps.learning_dashboard.learning_dashboard import learning_dashboard 
-from schemas.learning_dashboard_schema import UserProfile
+from apps.recommendation.entitlements import is_entitled
 
 router = APIRouter()
 
@@ -14,10 +13,7 @@ def give_feedback(
     current_user: User = Depends(require_employee)
 ):
     try:
-        dashboard = learning_dashboard(UserProfile(user_id=current_user.user_id))
-        allowed_course_ids = dashboard.course_id
-
-        if course_id not in allowed_course_ids:
+        if not is_entitled(current_user.user_id, course_id):
             raise HTTPException(
                 status_code=403,
                 detail="You dont have permission to access to this course"
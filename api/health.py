@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from core.health import health_monitor
+
+router = APIRouter()
+
+@router.get("/healthz", include_in_schema=False)
+def healthz():
+    """
+    Liveness: the process is up and serving requests.
+    """
+    return {"status": "ok"}
+
+@router.get("/readyz", include_in_schema=False)
+def readyz():
+    """
+    Readiness: last result of the background dependency probes.
+    """
+    status = health_monitor.readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
@@ -1,18 +1,29 @@
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
 from schemas.learning_dashboard_schema import UserProfile, LearningDashBoardResponse
-from apps.learning_dashboard.learning_dashboard import learning_dashboard
+from apps.learning_dashboard.learning_dashboard import learning_dashboard_async
+from apps.recommendation.version import get_user_version_async, etag_for, etag_matches
 from access_control.auth import require_employee, User
 
 router = APIRouter()
 
 @router.get("/learning-dashboard", response_model=LearningDashBoardResponse)
-def get_learning_dashboard(
+async def get_learning_dashboard(
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     current_user: User = Depends(require_employee)
 ):
     try:
+        version = await get_user_version_async(current_user.user_id)
+        if version is not None:
+            etag = etag_for(version)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+
         user_profile = UserProfile(user_id=current_user.user_id, update=False)
         
-        return learning_dashboard(user_profile)
+        return await learning_dashboard_async(user_profile)
 
     except HTTPException as he:
         raise he
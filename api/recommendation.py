@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
-from schemas.recommendation_schema import UserProfile, CourseRecommendation
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from schemas.recommendation_schema import (
+    UserProfile, CourseRecommendation, RecommendationJob, RecommendationJobAccepted,
+    BatchRecommendationRequest, BatchRecommendationStatus
+)
 from apps.recommendation.pipeline import main
-from access_control.auth import require_employee, User
+from apps.recommendation.jobs import get_job_manager
+from apps.recommendation.batch import submit_batch, get_batch
+from access_control.auth import require_employee, require_hr, User
 
 router = APIRouter()
 
@@ -17,3 +22,66 @@ def recommend_courses(
         raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/recommend-courses/jobs", response_model=RecommendationJobAccepted, status_code=202)
+def submit_recommendation_job(
+    request: Request,
+    response: Response,
+    update: bool = False,
+    current_user: User = Depends(require_employee)
+):
+    """
+    Queue a recommendation and return immediately; poll the status URL for the result.
+    Like POST /recommend-courses, stored recommendations are reused unless `update` is set.
+    """
+    user_profile = UserProfile(user_id=current_user.user_id, update=update)
+    job = get_job_manager().submit(user_profile)
+
+    status_url = str(request.url_for("get_recommendation_job", job_id=job.job_id))
+    response.headers["Location"] = status_url
+    return RecommendationJobAccepted(job_id=job.job_id, status=job.status, status_url=status_url)
+
+@router.get("/recommend-courses/jobs/{job_id}", response_model=RecommendationJob)
+def get_recommendation_job(
+    job_id: str,
+    current_user: User = Depends(require_employee)
+):
+    job = get_job_manager().get(job_id)
+    if job is None or job.user_id != current_user.user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/recommend-courses/batch", response_model=BatchRecommendationStatus, status_code=202)
+def submit_batch_recommendation(
+    batch_request: BatchRecommendationRequest,
+    response: Response,
+    request: Request,
+    current_user: User = Depends(require_hr)
+):
+    """
+    Recompute recommendations for a department, a list of employees, or everyone.
+    """
+    targets = [
+        batch_request.department_id is not None,
+        bool(batch_request.employee_ids),
+        batch_request.all_employees,
+    ]
+    if sum(targets) != 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Specify exactly one of department_id, employee_ids or all_employees"
+        )
+
+    run = submit_batch(batch_request.department_id, batch_request.employee_ids)
+    response.headers["Location"] = str(request.url_for("get_batch_recommendation", batch_id=run.batch_id))
+    return run
+
+@router.get("/recommend-courses/batch/{batch_id}", response_model=BatchRecommendationStatus)
+def get_batch_recommendation(
+    batch_id: str,
+    current_user: User = Depends(require_hr)
+):
+    run = get_batch(batch_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return run
@@ -1,17 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
 from access_control.auth import require_employee, User
 from schemas.skills_mapping_schema import UserProfile, SkillMappingResponse
-from apps.skills_mapping.skills_mapping import skills_mapping
+from apps.skills_mapping.skills_mapping import skills_mapping_async
+from apps.recommendation.version import get_user_version_async, etag_for, etag_matches
 
 router = APIRouter()
 
 @router.get("/skills-mapping", response_model=SkillMappingResponse)
-def get_skill_mapping(
+async def get_skill_mapping(
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     current_user: User = Depends(require_employee)
 ):
     try:
+        version = await get_user_version_async(current_user.user_id)
+        if version is not None:
+            etag = etag_for(version)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+
         user_profile = UserProfile(user_id=current_user.user_id)
-        return skills_mapping(user_profile)
+        return await skills_mapping_async(user_profile)
     except HTTPException as he:
         raise he
     except Exception as e:
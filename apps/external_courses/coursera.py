@@ -3,12 +3,14 @@ import time
 import random
 import json
 import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-from langdetect import detect
+from typing import TYPE_CHECKING, Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from database.db import COURSERA
 from core.config import Settings
+from core.metrics import track_dependency
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 settings = Settings()
 
@@ -27,11 +29,20 @@ session.headers.update({
 
 # ====== CACHE SKILLS ======
 CACHE_FILE = "skills_cache.json"
-if os.path.exists(CACHE_FILE):
-    with open(CACHE_FILE, "r", encoding="utf-8") as f:
-        skills_cache = json.load(f)
-else:
-    skills_cache = {}
+_skills_cache: Optional[Dict[str, List[str]]] = None
+
+
+def get_skills_cache() -> Dict[str, List[str]]:
+    """Skills per course slug, read from CACHE_FILE on first use."""
+    global _skills_cache
+
+    if _skills_cache is None:
+        if os.path.exists(CACHE_FILE):
+            with open(CACHE_FILE, "r", encoding="utf-8") as f:
+                _skills_cache = json.load(f)
+        else:
+            _skills_cache = {}
+    return _skills_cache
 
 
 def print_log(msg: str):
@@ -43,6 +54,7 @@ def extract_skills_from_slug(slug: str, domain_types: list) -> list[str]:
     if not slug or not domain_types:
         return []
 
+    skills_cache = get_skills_cache()
     if slug in skills_cache:
         return skills_cache[slug]
 
@@ -51,7 +63,8 @@ def extract_skills_from_slug(slug: str, domain_types: list) -> list[str]:
 
     try:
         headers = {"User-Agent": random.choice(USER_AGENTS)}
-        resp = session.get(url, headers=headers, timeout=10)
+        with track_dependency("coursera"):
+            resp = session.get(url, headers=headers, timeout=10)
 
         if resp.status_code in (403, 429):
             wait_time = 30 if resp.status_code == 429 else 10
@@ -60,6 +73,8 @@ def extract_skills_from_slug(slug: str, domain_types: list) -> list[str]:
             return []
 
         resp.raise_for_status()
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(resp.text, "html.parser")
 
         skill_selectors = [
@@ -84,6 +99,8 @@ def extract_skills_from_slug(slug: str, domain_types: list) -> list[str]:
 
 def fetch_course_data(course, coursera_cols):
     """Process a course into a clean data dict"""
+    from langdetect import detect
+
     lang = course.get("language", "")
     desc = course.get("description", "")
 
@@ -110,8 +127,10 @@ def fetch_course_data(course, coursera_cols):
     return row
 
 
-def collect_courses_data() -> pd.DataFrame:
+def collect_courses_data() -> "pd.DataFrame":
     """Collect course data from Coursera API"""
+    import pandas as pd
+
     all_courses = []
     start = 0
     url = settings.coursera.URI
@@ -138,7 +157,8 @@ def collect_courses_data() -> pd.DataFrame:
 
         for attempt in range(max_retries):
             try:
-                response = session.get(url, params=params, timeout=15)
+                with track_dependency("coursera"):
+                    response = session.get(url, params=params, timeout=15)
 
                 if response.status_code in (403, 429):
                     wait_time = 60 if response.status_code == 429 else 10
@@ -173,7 +193,7 @@ def collect_courses_data() -> pd.DataFrame:
         start += limit
 
     with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(skills_cache, f, ensure_ascii=False, indent=2)
+        json.dump(get_skills_cache(), f, ensure_ascii=False, indent=2)
 
     df = pd.DataFrame(all_courses)
 
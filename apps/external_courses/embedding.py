@@ -2,11 +2,11 @@ import time
 import json
 import random
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, TYPE_CHECKING
+from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from google import genai
-from google.genai import types
 from core.config import Settings
+from core.metrics import track_dependency
 from database.db import COURSERA
 import re
 
@@ -33,11 +33,21 @@ API_KEYS = [
     settings.embedding.KEY_EMBEDDING_3,
     settings.embedding.KEY_EMBEDDING_4,
 ]
-CLIENTS = [genai.Client(api_key=k) for k in API_KEYS if k]
+
+if TYPE_CHECKING:
+    from google import genai
+
+
+@lru_cache(maxsize=1)
+def get_clients() -> List["genai.Client"]:
+    """One Gemini client per configured key, built on first use."""
+    from google import genai
+
+    return [genai.Client(api_key=k) for k in API_KEYS if k]
 
 def _embed_texts_with_retry(
     texts: List[str],
-    client: genai.Client,
+    client: "genai.Client",
     task_type: str,
     output_dim: int,
     max_retries: int = 5,
@@ -47,17 +57,20 @@ def _embed_texts_with_retry(
     """
     Embed a list of texts with retry mechanism in case of rate-limiting or transient errors.
     """
+    from google.genai import types
+
     contents = [types.Content(parts=[types.Part(text=text.strip() or "empty text")]) for text in texts]
     embed_config = types.EmbedContentConfig(task_type=task_type, output_dimensionality=output_dim)
 
     for attempt in range(max_retries):
         try:
             time.sleep(random.uniform(0.05, 0.15))
-            response = client.models.embed_content(
-                model=GEMINI_EMBED_MODEL,
-                contents=contents,
-                config=embed_config
-            )
+            with track_dependency("gemini"):
+                response = client.models.embed_content(
+                    model=GEMINI_EMBED_MODEL,
+                    contents=contents,
+                    config=embed_config
+                )
             if hasattr(response, "embeddings") and response.embeddings:
                 return [e.values for e in response.embeddings]
             return [[] for _ in texts]
@@ -75,7 +88,7 @@ def _embed_texts_with_retry(
     return [[] for _ in texts]
 
 def _process_batch(
-    client: genai.Client,
+    client: "genai.Client",
     batch: List[str],
     batch_index: int,
     task_type: str,
@@ -113,6 +126,7 @@ def _embed_parallel(
         logger.warning("No texts provided for embedding.")
         return []
 
+    clients = get_clients()
     batches = [texts[i:i+batch_size] for i in range(0, len(texts), batch_size)]
     results = [None] * len(batches)
 
@@ -123,7 +137,7 @@ def _embed_parallel(
         futures = [
             executor.submit(
                 _process_batch,
-                CLIENTS[idx % len(CLIENTS)],
+                clients[idx % len(clients)],
                 batch,
                 idx,
                 task_type,
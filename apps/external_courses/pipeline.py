@@ -4,7 +4,6 @@ from database.session import insert_data
 from .embedding import embed_course_skills
 from .save_data import save_courses_embeddings
 from schemas.external_courses_schema import ExternalCourseResponse
-import pandas as pd
 
 def main() -> ExternalCourseResponse:
     try:
@@ -1,8 +1,10 @@
 from typing import List, Dict
 from pymilvus import Collection, CollectionSchema, FieldSchema, DataType, utility
 from database.session import connect_milvus
+from database.milvus import get_milvus_manager
 from database.db import COURSERAMilvusFields
 from core.config import Settings
+from core.metrics import track_dependency
 
 settings = Settings()
 
@@ -24,11 +26,13 @@ def create_course_collection(drop_if_exists: bool = False) -> Collection:
             except Exception as e:
                 print(f"❌ Error while dropping collection: {e}")
         else:
-            collection = Collection(name=COURSERAMilvusFields.COLLECTION_NAME)
-            collection.load()
+            collection = get_milvus_manager().get_collection(COURSERAMilvusFields.COLLECTION_NAME)
             print(f"Collection '{COURSERAMilvusFields.COLLECTION_NAME}' already exists and is loaded.")
             return collection
 
+    # Cached handles point at the dropped collection
+    get_milvus_manager().forget(COURSERAMilvusFields.COLLECTION_NAME)
+
     # Create a new collection if not exists
     print(f"Creating a new collection '{COURSERAMilvusFields.COLLECTION_NAME}'...")
     fields = [
@@ -139,8 +143,9 @@ def insert_course_data_batch(collection: Collection, data: List[Dict], batch_siz
             [item[COURSERAMilvusFields.EMBEDDING.value] for item in batch_slice],
         ]
         try:
-            collection.insert(batch)
-            collection.flush()
+            with track_dependency("milvus"):
+                collection.insert(batch)
+                collection.flush()
             print(f"✅ Inserted batch {i // batch_size + 1} ({len(batch_slice)} records)")
         except Exception as e:
             print(f"❌ Error inserting batch {i // batch_size + 1}: {e}")
@@ -161,6 +166,7 @@ def save_courses_embeddings(courses_data: List[Dict]) -> None:
                 print(f"⚠️ Existing collection '{COURSERAMilvusFields.COLLECTION_NAME}' dropped.")
             except Exception as e:
                 print(f"❌ Error dropping collection: {e}")
+            get_milvus_manager().forget(COURSERAMilvusFields.COLLECTION_NAME)
 
         # Create collection and insert data
         collection = create_course_collection(drop_if_exists=False)
@@ -1,6 +1,6 @@
 from schemas.feedback_schema import InputFeedBack, FeedBackResponse
 from database.db import COURSERA
-from database.session import get_data, upsert_data
+from database.session import get_by_key, upsert_data
 import json
 import logging
 
@@ -8,13 +8,11 @@ logger = logging.getLogger(__name__)
 
 def add_feedback(feedback_data: InputFeedBack) -> FeedBackResponse:
     try:
-        rows = get_data(schema=COURSERA.COURSE_DATABASE, table_name=COURSERA.COURSES_TABLE)
-        if not rows:
-            return FeedBackResponse(status="Course ID not found")
-
-        course_row = next(
-            (row for row in rows if row.get(COURSERA.COURSE_ID) == feedback_data.course_id),
-            None
+        course_row = get_by_key(
+            schema=COURSERA.COURSE_DATABASE,
+            table_name=COURSERA.COURSES_TABLE,
+            key_col=COURSERA.COURSE_ID,
+            key_value=feedback_data.course_id
         )
         if not course_row:
             return FeedBackResponse(status="Course ID not found")
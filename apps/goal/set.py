@@ -1,29 +1,23 @@
 from core.config import Settings
 from database.db import EmployeeTable
-from database.session import get_data, update_data
+from database.session import get_by_key, update_data
 from schemas.goal_schema import UserProfile, SetGoalResponse
-from schemas.recommendation_schema import UserProfile as InputRecommend
-from apps.recommendation.pipeline import main as run_recommendation
+from apps.recommendation.jobs import schedule_refresh
 
 settings = Settings()
 
 def set_goal(user_profile: UserProfile) -> SetGoalResponse:
     try:
-        employee_rows = get_data(
-            schema=EmployeeTable.EMPLOYEE_DATABASE.value,
-            table_name=EmployeeTable.EMPLOYEE_TABLE.value
-        )
-        if not employee_rows:
-            return SetGoalResponse(status="Employee table is empty")
-
         try:
             user_id_int = int(user_profile.user_id)
         except ValueError:
             return SetGoalResponse(status=f"Invalid user_id: {user_profile.user_id}")
 
-        employee_row = next(
-            (r for r in employee_rows if r.get(EmployeeTable.EMPLOYEE_ID.value) == user_id_int),
-            None
+        employee_row = get_by_key(
+            schema=EmployeeTable.EMPLOYEE_DATABASE.value,
+            table_name=EmployeeTable.EMPLOYEE_TABLE.value,
+            key_col=EmployeeTable.EMPLOYEE_ID.value,
+            key_value=user_id_int
         )
         if not employee_row:
             return SetGoalResponse(status=f"User {user_profile.user_id} not found")
@@ -42,9 +36,9 @@ def set_goal(user_profile: UserProfile) -> SetGoalResponse:
             condition_cols=[EmployeeTable.EMPLOYEE_ID.value]
         )
 
-        run_recommendation(InputRecommend(user_id=str(user_id_int), update=True))
+        schedule_refresh(str(user_id_int))
 
-        return SetGoalResponse(status="Goal updated and recommendation refreshed.")
+        return SetGoalResponse(status="Goal updated; recommendation refresh scheduled.")
 
     except Exception as e:
         print(f"[ERROR] Exception occurred: {e}")
@@ -1,62 +1,93 @@
-from database.session import get_data
+import asyncio
+from database.session import get_by_key, get_where
+from database.async_session import async_get_by_key, async_get_where
 from database.db import EmployeeTable, EmployeeCourse, COURSERA
 import json
 from schemas.learning_dashboard_schema import UserProfile, LearningDashBoardResponse
 from apps.recommendation.pipeline import main  
 
 
-def get_course_ids_by_names(course_names: list[str]) -> list[str]:
-    """Retrieval course_id from Postgres based on course_name list"""
-    course_rows = get_data(
-        schema=COURSERA.COURSE_DATABASE.value,
-        table_name=COURSERA.COURSES_TABLE.value
-    )
+def _cast_user_id(user_id: str):
+    try:
+        return int(user_id)
+    except ValueError:
+        return str(user_id)
+
+
+def _learning_goals(employee_row: dict) -> list[str]:
+    aspiration_raw = employee_row.get(EmployeeTable.ASPIRATION.value) or ""
+    return [goal.strip() for goal in aspiration_raw.split(",") if goal.strip()]
+
+
+def _recommended_courses(course_row: dict) -> list[str]:
+    courses_raw = course_row.get(EmployeeCourse.COURSES.value) or "[]"
+    try:
+        return json.loads(courses_raw)
+    except json.JSONDecodeError:
+        return []
+
 
+def _map_course_ids(course_names: list[str], course_rows: list[dict]) -> list[str]:
     name_to_id = {
         row.get(COURSERA.COURSE_NAME.value): row.get(COURSERA.COURSE_ID.value)
         for row in course_rows
     }
+    return [name_to_id.get(name, "") for name in course_names]
 
-    course_ids = [name_to_id.get(name, "") for name in course_names]
-    return course_ids
+
+def get_course_ids_by_names(course_names: list[str]) -> list[str]:
+    """Retrieval course_id from Postgres based on course_name list"""
+    if not course_names:
+        return []
+
+    course_rows = get_where(
+        schema=COURSERA.COURSE_DATABASE.value,
+        table_name=COURSERA.COURSES_TABLE.value,
+        filters={COURSERA.COURSE_NAME.value: list(set(course_names))},
+        columns=[COURSERA.COURSE_NAME.value, COURSERA.COURSE_ID.value]
+    )
+    return _map_course_ids(course_names, course_rows)
+
+
+async def get_course_ids_by_names_async(course_names: list[str]) -> list[str]:
+    if not course_names:
+        return []
+
+    course_rows = await async_get_where(
+        schema=COURSERA.COURSE_DATABASE.value,
+        table_name=COURSERA.COURSES_TABLE.value,
+        filters={COURSERA.COURSE_NAME.value: list(set(course_names))},
+        columns=[COURSERA.COURSE_NAME.value, COURSERA.COURSE_ID.value]
+    )
+    return _map_course_ids(course_names, course_rows)
 
 
 def learning_dashboard(user_profile: UserProfile) -> LearningDashBoardResponse:
     user_id = user_profile.user_id
-    try:
-        user_id_casted = int(user_id)
-    except ValueError:
-        user_id_casted = str(user_id)
+    user_id_casted = _cast_user_id(user_id)
 
-    employee_rows = get_data(
+    employee_row = get_by_key(
         schema=EmployeeTable.EMPLOYEE_DATABASE.value,
-        table_name=EmployeeTable.EMPLOYEE_TABLE.value
-    )
-    employee_row = next(
-        (r for r in employee_rows if r.get(EmployeeTable.EMPLOYEE_ID.value) == user_id_casted),
-        None
+        table_name=EmployeeTable.EMPLOYEE_TABLE.value,
+        key_col=EmployeeTable.EMPLOYEE_ID.value,
+        key_value=user_id_casted,
+        columns=[EmployeeTable.ASPIRATION.value]
     )
     if not employee_row:
         raise Exception(f"User {user_id} not found in employee table")
 
-    aspiration_raw = employee_row.get(EmployeeTable.ASPIRATION.value) or ""
-    learning_goals = [goal.strip() for goal in aspiration_raw.split(",") if goal.strip()]
+    learning_goals = _learning_goals(employee_row)
 
-    course_rows = get_data(
+    course_row = get_by_key(
         schema=EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
-        table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value
-    )
-    course_row = next(
-        (r for r in course_rows if r.get(EmployeeCourse.EMPLOYEE_ID.value) == user_id_casted),
-        None
+        table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value,
+        key_col=EmployeeCourse.EMPLOYEE_ID.value,
+        key_value=user_id_casted,
+        columns=[EmployeeCourse.COURSES.value]
     )
 
     if course_row:
-        courses_raw = course_row.get(EmployeeCourse.COURSES.value) or "[]"
-        try:
-            recommended_courses = json.loads(courses_raw)
-        except json.JSONDecodeError:
-            recommended_courses = []
+        recommended_courses = _recommended_courses(course_row)
     else:
         rec_result = main(user_profile)
         recommended_courses = rec_result.courses
@@ -69,3 +100,48 @@ def learning_dashboard(user_profile: UserProfile) -> LearningDashBoardResponse:
         recommended_courses=recommended_courses,
         course_id=course_ids
     )
+
+
+async def learning_dashboard_async(user_profile: UserProfile) -> LearningDashBoardResponse:
+    """
+    Same as learning_dashboard, but reads through the async DB layer.
+    The recommendation fallback is still sync and runs in a worker thread.
+    """
+    user_id = user_profile.user_id
+    user_id_casted = _cast_user_id(user_id)
+
+    employee_row, course_row = await asyncio.gather(
+        async_get_by_key(
+            schema=EmployeeTable.EMPLOYEE_DATABASE.value,
+            table_name=EmployeeTable.EMPLOYEE_TABLE.value,
+            key_col=EmployeeTable.EMPLOYEE_ID.value,
+            key_value=user_id_casted,
+            columns=[EmployeeTable.ASPIRATION.value]
+        ),
+        async_get_by_key(
+            schema=EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
+            table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value,
+            key_col=EmployeeCourse.EMPLOYEE_ID.value,
+            key_value=user_id_casted,
+            columns=[EmployeeCourse.COURSES.value]
+        ),
+    )
+    if not employee_row:
+        raise Exception(f"User {user_id} not found in employee table")
+
+    learning_goals = _learning_goals(employee_row)
+
+    if course_row:
+        recommended_courses = _recommended_courses(course_row)
+    else:
+        rec_result = await asyncio.to_thread(main, user_profile)
+        recommended_courses = rec_result.courses
+
+    course_ids = await get_course_ids_by_names_async(recommended_courses)
+
+    return LearningDashBoardResponse(
+        user_id=user_id,
+        learning_goals=learning_goals,
+        recommended_courses=recommended_courses,
+        course_id=course_ids
+    )
@@ -0,0 +1,353 @@
+"""
+Recompute course recommendations for many employees at once.
+
+    python -m apps.recommendation.batch --department Marketing
+    python -m apps.recommendation.batch --employees 101,102,103
+    python -m apps.recommendation.batch --all --workers 16
+
+Employees are loaded in one query, identical profiles share one skill-mapping
+call, and identical skills across employees are embedded and searched once, several
+skills per Milvus request.
+Results are written with a single bulk upsert into employee_courses.
+"""
+import sys
+import time
+import uuid
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from core.config import Settings
+from database.db import EmployeeCourse, EmployeeTable
+from database.session import get_where, upsert_data
+from schemas.recommendation_schema import JobStatus, BatchRecommendationStatus
+from .embedding import embed_skills
+from .map_skill import map_skill
+from .recommendation import (
+    search_skills_courses, select_courses, fetch_course_details, build_recommendation
+)
+from .pipeline import parse_employee_profile, build_course_row
+from .entitlements import replace_entitlements, course_ids_from_result
+
+recommendation = Settings().recommendation
+
+PROFILE_COLUMNS = [
+    EmployeeTable.EMPLOYEE_ID.value,
+    EmployeeTable.ASPIRATION.value,
+    EmployeeTable.CURRENT_SKILL.value,
+    EmployeeTable.SKILL_GAP.value,
+]
+
+# (aspiration, current_role, existing_skills, skill_gaps)
+ProfileKey = Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]
+# embed_skills only uses the aspiration to decide whether to add a "Skills: " context prefix
+SkillKey = Tuple[bool, str]
+
+
+def load_target_employees(
+    department_id: Optional[str] = None,
+    employee_ids: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Every targeted employees row in one query; no filter means the whole company."""
+    filters: Dict[str, Any] = {}
+    if department_id is not None:
+        filters[EmployeeTable.DEPARTMENT_ID.value] = department_id
+    if employee_ids:
+        filters[EmployeeTable.EMPLOYEE_ID.value] = list(employee_ids)
+
+    return get_where(
+        EmployeeTable.EMPLOYEE_DATABASE.value,
+        EmployeeTable.EMPLOYEE_TABLE.value,
+        filters,
+        columns=PROFILE_COLUMNS
+    )
+
+
+def _map_profile(profile: ProfileKey) -> List[str]:
+    aspiration, current_role, existing_skills, skill_gaps = profile
+    return map_skill(
+        current_occupation=current_role,
+        target_occupation=aspiration,
+        existing_skills=list(existing_skills),
+        known_missing_skills=list(skill_gaps)
+    )
+
+
+def _normalize_skill(skill: str) -> str:
+    return skill.strip().lower()
+
+
+def recompute_recommendations(
+    department_id: Optional[str] = None,
+    employee_ids: Optional[List[str]] = None,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Recompute and store recommendations for the targeted employees.
+    Returns a summary with counts, failures and timings.
+    """
+    workers = workers or recommendation.BATCH_WORKERS
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+
+    def lap(stage: str, since: float) -> float:
+        now = time.perf_counter()
+        timings[stage] = round(now - since, 3)
+        print(f"[batch] {stage}: {timings[stage]}s")
+        return now
+
+    employees = load_target_employees(department_id, employee_ids)
+    mark = lap("load_employees", started)
+
+    # Requested ids with no employees row (e.g. a typo) are reported, not silently dropped
+    failed: Dict[str, str] = {}
+    found = {str(row[EmployeeTable.EMPLOYEE_ID.value]) for row in employees}
+    for user_id in dict.fromkeys(str(e) for e in employee_ids or []):
+        if user_id not in found:
+            failed[user_id] = "employee not found"
+
+    if not employees:
+        return {
+            "employees": 0,
+            "updated": 0,
+            "failed": [{"employee_id": user_id, "error": error} for user_id, error in failed.items()],
+            "timings": timings,
+        }
+
+    # 1. One skill-mapping call per distinct profile
+    profile_users: Dict[ProfileKey, List[str]] = {}
+    for row in employees:
+        aspiration, current_role, existing_skills, skill_gaps = parse_employee_profile(row)
+        key = (aspiration or "", current_role, tuple(existing_skills), tuple(skill_gaps))
+        profile_users.setdefault(key, []).append(str(row[EmployeeTable.EMPLOYEE_ID.value]))
+
+    profile_skills: Dict[ProfileKey, List[str]] = {}
+    profiles = list(profile_users)
+
+    def map_one(profile: ProfileKey):
+        try:
+            return profile, _map_profile(profile), None
+        except Exception as e:
+            return profile, None, e
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for profile, skills, error in executor.map(map_one, profiles):
+            if error is not None:
+                for user_id in profile_users[profile]:
+                    failed[user_id] = f"map_skill: {error}"
+            else:
+                profile_skills[profile] = skills
+    mark = lap("map_skills", mark)
+
+    # 2. Embed each distinct skill once
+    unique_skills: Dict[SkillKey, None] = {}
+    for profile, skills in profile_skills.items():
+        with_context = bool(profile[0])
+        for skill in skills:
+            norm = _normalize_skill(skill)
+            if norm:
+                unique_skills[(with_context, norm)] = None
+
+    vectors: Dict[SkillKey, List[float]] = {}
+    for with_context in (True, False):
+        group = [skill for ctx, skill in unique_skills if ctx == with_context]
+        if not group:
+            continue
+        embedded = embed_skills(group, aspiration="context" if with_context else "")
+        for skill, vector in zip(group, embedded):
+            if vector:
+                vectors[(with_context, skill)] = vector
+    mark = lap("embed_skills", mark)
+
+    # 3. Search each distinct skill once, SEARCH_BATCH_SIZE vectors per Milvus request
+    matches: Dict[SkillKey, List[Dict]] = {}
+    search_errors: Dict[SkillKey, str] = {}
+    items = list(vectors.items())
+    batch_size = max(1, recommendation.SEARCH_BATCH_SIZE)
+    chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    def search_chunk(chunk: List[Tuple[SkillKey, List[float]]]):
+        try:
+            return chunk, search_skills_courses([vector for _, vector in chunk]), None
+        except Exception as e:
+            print(f"⚠️ Course search failed for {len(chunk)} skills: {e}")
+            return chunk, None, e
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk, results, error in executor.map(search_chunk, chunks):
+            if error is not None:
+                for key, _ in chunk:
+                    search_errors[key] = str(error)
+                continue
+            for (key, _), courses in zip(chunk, results):
+                matches[key] = courses
+    mark = lap("search_courses", mark)
+
+    # A profile with any failed search keeps its stored recommendations, like a
+    # failed single-user run: results built on missing matches are never written
+    solvable: List[ProfileKey] = []
+    for profile, skills in profile_skills.items():
+        with_context = bool(profile[0])
+        error = next(
+            (search_errors[key] for key in ((with_context, _normalize_skill(s)) for s in skills)
+             if key in search_errors),
+            None
+        )
+        if error is not None:
+            for user_id in profile_users[profile]:
+                failed[user_id] = f"search: {error}"
+        else:
+            solvable.append(profile)
+
+    # 4. Solve each distinct profile, fetch display fields for all selected courses at once,
+    #    and fan the result out to the profile's employees
+    def solve_one(profile: ProfileKey):
+        skills = profile_skills[profile]
+        with_context = bool(profile[0])
+        skill_matches = {}
+        for skill in skills:
+            courses = matches.get((with_context, _normalize_skill(skill)))
+            if courses:
+                skill_matches.setdefault(skill.lower(), []).extend(courses)
+        try:
+            return profile, select_courses(skills, skill_matches), None
+        except Exception as e:
+            return profile, None, e
+
+    selections: Dict[ProfileKey, Dict] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for profile, selection, error in executor.map(solve_one, solvable):
+            if error is not None:
+                for user_id in profile_users[profile]:
+                    failed[user_id] = f"solve: {error}"
+            else:
+                selections[profile] = selection
+
+    details = fetch_course_details([
+        cid for selection in selections.values() for cid in selection["selected_ids"]
+    ])
+
+    rows: List[Dict[str, Any]] = []
+    entitlements: Dict[str, List[str]] = {}
+    for profile, selection in selections.items():
+        result = build_recommendation(selection, details)
+        for user_id in profile_users[profile]:
+            rows.append(build_course_row(user_id, result))
+            entitlements[user_id] = course_ids_from_result(result)
+    mark = lap("solve", mark)
+
+    # 5. One bulk write
+    write_stats = upsert_data(
+        data=rows,
+        schema=EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
+        table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value,
+        conflict_cols=[EmployeeCourse.EMPLOYEE_ID.value]
+    )
+    if entitlements:
+        replace_entitlements(entitlements)
+    lap("write", mark)
+    timings["total"] = round(time.perf_counter() - started, 3)
+
+    total_skills = sum(len(skills) for skills in profile_skills.values())
+    return {
+        "employees": len(employees),
+        "distinct_profiles": len(profile_users),
+        "skills": total_skills,
+        "distinct_skills": len(unique_skills),
+        "updated": len(rows),
+        "failed": [{"employee_id": user_id, "error": error} for user_id, error in failed.items()],
+        "write": write_stats,
+        "timings": timings,
+    }
+
+
+# ====== BACKGROUND RUNS (API) ======
+# Finished runs are dropped JOB_RESULT_TTL seconds after their last update,
+# like recommendation jobs; queued and running ones are kept.
+_runs: Dict[str, BatchRecommendationStatus] = {}
+_runs_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _purge_runs(now: float) -> None:
+    expired = [
+        batch_id for batch_id, run in _runs.items()
+        if run.status not in (JobStatus.QUEUED, JobStatus.RUNNING)
+        and now - run.updated_at > recommendation.JOB_RESULT_TTL
+    ]
+    for batch_id in expired:
+        del _runs[batch_id]
+
+
+def _update_run(batch_id: str, **fields) -> None:
+    with _runs_lock:
+        _runs[batch_id] = _runs[batch_id].model_copy(update={**fields, "updated_at": time.time()})
+
+
+def _run_batch(batch_id: str, department_id: Optional[str], employee_ids: Optional[List[str]]) -> None:
+    _update_run(batch_id, status=JobStatus.RUNNING)
+    try:
+        summary = recompute_recommendations(department_id, employee_ids)
+    except Exception as e:
+        print(f"❌ Batch recommendation {batch_id} failed: {e}")
+        _update_run(batch_id, status=JobStatus.FAILED, error=str(e))
+        return
+    _update_run(batch_id, status=JobStatus.SUCCEEDED, summary=summary)
+
+
+def submit_batch(
+    department_id: Optional[str] = None,
+    employee_ids: Optional[List[str]] = None
+) -> BatchRecommendationStatus:
+    """
+    Queue a batch recompute. Batches run one at a time; each one already
+    uses BATCH_WORKERS threads internally.
+    """
+    global _executor
+
+    now = time.time()
+    run = BatchRecommendationStatus(
+        batch_id=uuid.uuid4().hex,
+        status=JobStatus.QUEUED,
+        department_id=department_id,
+        employee_ids=employee_ids,
+        created_at=now,
+        updated_at=now
+    )
+    with _runs_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recommend-batch")
+        _purge_runs(now)
+        _runs[run.batch_id] = run
+        _executor.submit(_run_batch, run.batch_id, department_id, employee_ids)
+    return run
+
+
+def get_batch(batch_id: str) -> Optional[BatchRecommendationStatus]:
+    with _runs_lock:
+        _purge_runs(time.time())
+        return _runs.get(batch_id)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recompute course recommendations in bulk.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--department", help="department_id to recompute, e.g. Marketing")
+    target.add_argument("--employees", help="comma-separated employee ids")
+    target.add_argument("--all", action="store_true", help="every employee")
+    parser.add_argument("--workers", type=int, default=None, help="parallel LLM / search / solve calls")
+    args = parser.parse_args()
+
+    employee_ids = [e.strip() for e in args.employees.split(",") if e.strip()] if args.employees else None
+    summary = recompute_recommendations(args.department, employee_ids, workers=args.workers)
+
+    print(f"✅ Updated {summary['updated']}/{summary['employees']} employees "
+          f"({summary.get('distinct_skills', 0)} distinct of {summary.get('skills', 0)} skills) "
+          f"in {summary['timings'].get('total', 0)}s")
+    for failure in summary["failed"]:
+        print(f"❌ {failure['employee_id']}: {failure['error']}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
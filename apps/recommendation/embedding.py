@@ -1,17 +1,27 @@
 import time
 import random
-from typing import List
-from google import genai
-from google.genai import types
+from functools import lru_cache
+from typing import List, TYPE_CHECKING
 from core.config import Settings
+from core.metrics import track_dependency
+
+if TYPE_CHECKING:
+    from google import genai
 
 embedding_settings = Settings().embedding
-client_main = genai.Client(api_key=embedding_settings.KEY_EMBEDDING_3)
-client_fallback = genai.Client(api_key=embedding_settings.KEY_EMBEDDING_4)
+
+
+@lru_cache(maxsize=None)
+def get_client(api_key: str) -> "genai.Client":
+    """Gemini client for a key, built (and google.genai imported) on first use."""
+    from google import genai
+
+    return genai.Client(api_key=api_key)
+
 
 def _embed_texts_with_retry(
     texts: List[str],
-    client: genai.Client,
+    client: "genai.Client",
     model: str,
     task_type: str,
     output_dim: int,
@@ -20,6 +30,8 @@ def _embed_texts_with_retry(
     retry_max: float
 ) -> List[List[float]]:
     """Handles embedding with retry mechanism."""
+    from google.genai import types
+
     contents = [
         types.Content(parts=[types.Part(text=text.strip() or "empty text")])
         for text in texts
@@ -32,11 +44,12 @@ def _embed_texts_with_retry(
     for attempt in range(max_retries):
         try:
             time.sleep(random.uniform(0.3, 0.6)) 
-            response = client.models.embed_content(
-                model=model,
-                contents=contents,
-                config=embed_config
-            )
+            with track_dependency("gemini"):
+                response = client.models.embed_content(
+                    model=model,
+                    contents=contents,
+                    config=embed_config
+                )
             if response.embeddings:
                 return [e.values for e in response.embeddings]
             return [[] for _ in texts]
@@ -59,7 +72,7 @@ def _embed_with_fallback(
     """Attempt embedding with main client, fallback if failed."""
     vectors = _embed_texts_with_retry(
         texts=texts,
-        client=client_main,
+        client=get_client(embedding_settings.KEY_EMBEDDING_3),
         model=embedding_settings.GEMINI_EMBED_MODEL,
         task_type=config_dict["task_type"],
         output_dim=config_dict["output_dimensionality"],
@@ -72,7 +85,7 @@ def _embed_with_fallback(
         print("Using fallback client...")
         vectors = _embed_texts_with_retry(
             texts=texts,
-            client=client_fallback,
+            client=get_client(embedding_settings.KEY_EMBEDDING_4),
             model=embedding_settings.GEMINI_EMBED_MODEL,
             task_type=config_dict["task_type"],
             output_dim=config_dict["output_dimensionality"],
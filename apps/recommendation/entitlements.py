@@ -0,0 +1,101 @@
+import json
+from typing import Any, Dict, List
+from database.db import CourseEntitlement, EmployeeCourse, COURSERA
+from database.session import get_where, get_by_key, replace_data
+
+# Which courses a user may act on (e.g. leave feedback for): the courses
+# currently recommended to them. Rewritten whenever recommendations are
+# persisted, so checking one (user, course) pair is a primary-key read.
+
+
+def course_ids_from_result(result: Dict[str, Any]) -> List[str]:
+    """Course ids of a solve_course_recommendation result"""
+    return [
+        str(course["id"])
+        for course in result.get("recommended_courses", [])
+        if course.get("id") is not None
+    ]
+
+
+def replace_entitlements(user_courses: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Make each user's entitlements exactly the given course ids."""
+    rows = [
+        {
+            CourseEntitlement.EMPLOYEE_ID.value: str(user_id),
+            CourseEntitlement.COURSE_ID.value: str(course_id),
+        }
+        for user_id, course_ids in user_courses.items()
+        for course_id in dict.fromkeys(course_ids)
+    ]
+    return replace_data(
+        data=rows,
+        schema=CourseEntitlement.ENTITLEMENT_DATABASE.value,
+        table_name=CourseEntitlement.ENTITLEMENT_TABLE.value,
+        key_col=CourseEntitlement.EMPLOYEE_ID.value,
+        key_values=[str(user_id) for user_id in user_courses],
+        conflict_cols=[CourseEntitlement.EMPLOYEE_ID.value, CourseEntitlement.COURSE_ID.value]
+    )
+
+
+def _has_entitlements(user_id: str) -> bool:
+    return bool(get_where(
+        CourseEntitlement.ENTITLEMENT_DATABASE.value,
+        CourseEntitlement.ENTITLEMENT_TABLE.value,
+        {CourseEntitlement.EMPLOYEE_ID.value: user_id},
+        limit=1,
+        columns=[CourseEntitlement.COURSE_ID.value]
+    ))
+
+
+def _stored_course_ids(user_id: str) -> List[str]:
+    """
+    Course ids from the user's stored employee_courses names, for users whose
+    recommendations predate the entitlements table. Never runs the pipeline.
+    """
+    course_row = get_by_key(
+        schema=EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
+        table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value,
+        key_col=EmployeeCourse.EMPLOYEE_ID.value,
+        key_value=user_id,
+        columns=[EmployeeCourse.COURSES.value]
+    )
+    if not course_row:
+        return []
+
+    try:
+        course_names = json.loads(course_row.get(EmployeeCourse.COURSES.value) or "[]")
+    except (TypeError, json.JSONDecodeError):
+        return []
+    if not course_names:
+        return []
+
+    course_rows = get_where(
+        schema=COURSERA.COURSE_DATABASE.value,
+        table_name=COURSERA.COURSES_TABLE.value,
+        filters={COURSERA.COURSE_NAME.value: list(set(course_names))},
+        columns=[COURSERA.COURSE_ID.value]
+    )
+    return [str(row[COURSERA.COURSE_ID.value]) for row in course_rows]
+
+
+def is_entitled(user_id: str, course_id: str) -> bool:
+    user_id = str(user_id)
+    course_id = str(course_id)
+
+    if get_where(
+        CourseEntitlement.ENTITLEMENT_DATABASE.value,
+        CourseEntitlement.ENTITLEMENT_TABLE.value,
+        {CourseEntitlement.EMPLOYEE_ID.value: user_id, CourseEntitlement.COURSE_ID.value: course_id},
+        limit=1,
+        columns=[CourseEntitlement.COURSE_ID.value]
+    ):
+        return True
+
+    if _has_entitlements(user_id):
+        return False
+
+    # Backfill users recommended before entitlements were recorded
+    course_ids = _stored_course_ids(user_id)
+    if course_ids:
+        replace_entitlements({user_id: course_ids})
+    return course_id in course_ids
@@ -0,0 +1,260 @@
+import time
+import uuid
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from core.config import Settings
+from schemas.recommendation_schema import UserProfile, RecommendationJob, JobStatus
+from apps.recommendation.pipeline import main
+
+recommendation = Settings().recommendation
+
+ACTIVE_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class JobStore(ABC):
+    """
+    Where recommendation jobs live between submit and poll.
+    Implementations must be safe to call from several worker threads.
+    """
+
+    @abstractmethod
+    def create(self, user_id: str, update: bool = False) -> RecommendationJob:
+        """Store a new queued job for the user."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[RecommendationJob]:
+        """The job, or None if unknown or expired."""
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> Optional[RecommendationJob]:
+        """Apply fields to the job and bump updated_at; None if unknown."""
+
+    @abstractmethod
+    def find_active(self, user_id: str) -> Optional[RecommendationJob]:
+        """A queued or running job of this user, if any."""
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local store. Finished jobs are dropped `ttl` seconds after their
+    last update. Jobs are not shared between replicas or kept across restarts.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._jobs: Dict[str, RecommendationJob] = {}
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float) -> None:
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status not in ACTIVE_STATUSES and now - job.updated_at > self.ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def create(self, user_id: str, update: bool = False) -> RecommendationJob:
+        now = time.time()
+        job = RecommendationJob(
+            job_id=uuid.uuid4().hex,
+            user_id=user_id,
+            status=JobStatus.QUEUED,
+            update=update,
+            created_at=now,
+            updated_at=now
+        )
+        with self._lock:
+            self._purge(now)
+            self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[RecommendationJob]:
+        with self._lock:
+            self._purge(time.time())
+            return self._jobs.get(job_id)
+
+    def update(self, job_id: str, **fields) -> Optional[RecommendationJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = job.model_copy(update={**fields, "updated_at": time.time()})
+            self._jobs[job_id] = job
+            return job
+
+    def find_active(self, user_id: str) -> Optional[RecommendationJob]:
+        with self._lock:
+            for job in self._jobs.values():
+                if job.user_id == user_id and job.status in ACTIVE_STATUSES:
+                    return job
+        return None
+
+
+JOB_STORES: Dict[str, Callable[[], JobStore]] = {
+    "memory": lambda: InMemoryJobStore(ttl=recommendation.JOB_RESULT_TTL),
+}
+
+
+def register_job_store(name: str, factory: Callable[[], JobStore]) -> None:
+    """Make a store selectable with the JOB_STORE setting."""
+    JOB_STORES[name] = factory
+
+
+class RecommendationJobManager:
+    """
+    Runs apps.recommendation.pipeline.main on a bounded worker pool, outside
+    the HTTP worker that accepted the request. A user with a job still queued
+    or running gets that job back instead of a second one; if it is already
+    running, one more run is queued to start when it finishes, so data
+    written after it began is still picked up. Coalescing never drops a
+    recompute: an update=True request upgrades the queued job or rerun it joins.
+    """
+
+    def __init__(self, store: JobStore, max_workers: int):
+        self.store = store
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recommend-job")
+        self._submit_lock = threading.Lock()
+        self._rerun: Dict[str, UserProfile] = {}
+
+    def submit(self, user: UserProfile) -> RecommendationJob:
+        user_id = str(user.user_id)
+        with self._submit_lock:
+            active = self.store.find_active(user_id)
+            if active is not None:
+                if active.status == JobStatus.RUNNING:
+                    pending = self._rerun.get(user_id)
+                    update = bool(user.update) or bool(pending is not None and pending.update)
+                    self._rerun[user_id] = user.model_copy(update={"update": update})
+                elif user.update and not active.update:
+                    # Not started yet: _run reads the flag from the job when it starts
+                    active = self.store.update(active.job_id, update=True) or active
+                return active
+            job = self.store.create(user_id, update=bool(user.update))
+        self._executor.submit(self._run, job.job_id, user)
+        return job
+
+    def _finish(self, user_id: str) -> None:
+        with self._submit_lock:
+            rerun = self._rerun.pop(user_id, None)
+        if rerun is not None:
+            self.submit(rerun)
+
+    def get(self, job_id: str) -> Optional[RecommendationJob]:
+        return self.store.get(job_id)
+
+    def _run(self, job_id: str, user: UserProfile) -> None:
+        def progress(stage: str, fraction: float) -> None:
+            self.store.update(job_id, stage=stage, progress=fraction)
+
+        with self._submit_lock:
+            job = self.store.update(job_id, status=JobStatus.RUNNING)
+        if job is not None:
+            user = user.model_copy(update={"update": job.update})
+        try:
+            result = main(user, progress=progress)
+        except Exception as e:
+            print(f"❌ Recommendation job {job_id} failed: {e}")
+            with self._submit_lock:
+                self.store.update(job_id, status=JobStatus.FAILED, error=str(e))
+        else:
+            with self._submit_lock:
+                self.store.update(job_id, status=JobStatus.SUCCEEDED, stage="done", progress=1.0, result=result)
+        self._finish(str(user.user_id))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RefreshScheduler:
+    """
+    Coalesces refresh requests per user: each request restarts the user's
+    debounce timer, and only when it expires is one job submitted. The job
+    reads the employee row when it starts, so it sees the latest write.
+    """
+
+    def __init__(self, debounce: float, submit: Callable[[UserProfile], RecommendationJob]):
+        self.debounce = debounce
+        self._submit = submit
+        self._timers: Dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, user_id: str) -> None:
+        user_id = str(user_id)
+        with self._lock:
+            timer = self._timers.pop(user_id, None)
+            if timer is not None:
+                timer.cancel()
+            timer = threading.Timer(self.debounce, self._fire, args=(user_id,))
+            timer.daemon = True
+            self._timers[user_id] = timer
+            timer.start()
+
+    def _fire(self, user_id: str) -> None:
+        with self._lock:
+            if self._timers.get(user_id) is not threading.current_thread():
+                return
+            del self._timers[user_id]
+        try:
+            self._submit(UserProfile(user_id=user_id, update=True))
+        except Exception as e:
+            print(f"❌ Could not submit recommendation refresh for user {user_id}: {e}")
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._timers)
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+
+
+_manager: Optional[RecommendationJobManager] = None
+_manager_lock = threading.Lock()
+_scheduler: Optional[RefreshScheduler] = None
+
+
+def get_job_manager() -> RecommendationJobManager:
+    global _manager
+
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                factory = JOB_STORES.get(recommendation.JOB_STORE)
+                if factory is None:
+                    raise ValueError(f"Unknown JOB_STORE '{recommendation.JOB_STORE}'")
+                _manager = RecommendationJobManager(factory(), max_workers=recommendation.JOB_WORKERS)
+    return _manager
+
+
+def schedule_refresh(user_id: str) -> None:
+    """
+    Recompute a user's recommendations in the background once their edits
+    have been quiet for REFRESH_DEBOUNCE_SECONDS.
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        with _manager_lock:
+            if _scheduler is None:
+                _scheduler = RefreshScheduler(
+                    debounce=recommendation.REFRESH_DEBOUNCE_SECONDS,
+                    submit=lambda user: get_job_manager().submit(user)
+                )
+    _scheduler.schedule(user_id)
+
+
+def shutdown_job_manager() -> None:
+    global _manager, _scheduler
+
+    with _manager_lock:
+        if _scheduler is not None:
+            _scheduler.cancel_all()
+            _scheduler = None
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
@@ -1,24 +1,35 @@
 import json
 import re
+from functools import lru_cache
 from typing import List
-import google.generativeai as genai
-from google.api_core.exceptions import ResourceExhausted
 from core.config import Settings
+from core.metrics import track_dependency
 
 embedding_settings = Settings().embedding
 generate = Settings().generate
 
-genai.configure(api_key=generate.KEY_GEN_1)
+
+@lru_cache(maxsize=1)
+def _get_genai():
+    """Import and configure google.generativeai on first use."""
+    import google.generativeai as genai
+
+    genai.configure(api_key=generate.KEY_GEN_1)
+    return genai
 
 def clean_json_text(text: str) -> str:
     text = re.sub(r"```(json)?", "", text, flags=re.IGNORECASE).strip("` \n")
     return text.strip()
 
 def try_generate(prompt: str, keys: List[str]) -> str:
+    from google.api_core.exceptions import ResourceExhausted
+
+    genai = _get_genai()
     for key in keys:
         try:
             model = genai.GenerativeModel(generate.GEMINI_GENERATE_MODEL)
-            response = model.generate_content(prompt)
+            with track_dependency("gemini"):
+                response = model.generate_content(prompt)
             return clean_json_text(response.text.strip())
         except ResourceExhausted:
             print(f"API key quota exceeded: {key[:10]}... Trying next key.")
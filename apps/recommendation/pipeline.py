@@ -1,52 +1,42 @@
 import json
-from typing import Optional
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from .embedding import embed_skills
 from .map_skill import map_skill
 from .recommendation import solve_course_recommendation
 from database.db import EmployeeCourse, EmployeeTable
-from database.session import get_data, update_data, insert_employee_courses
+from database.session import get_by_key, update_data, insert_employee_courses
 from schemas.recommendation_schema import UserProfile, CourseRecommendation
+from .entitlements import replace_entitlements, course_ids_from_result
 
-def get_employee_field(user_id: str, field: str) -> Optional[str]:
-    """Lấy giá trị field của employee theo user_id"""
-    rows = get_data(
+def get_employee_row(user_id: str) -> Optional[Dict[str, Any]]:
+    """Lấy bản ghi employee theo user_id"""
+    row = get_by_key(
         schema=EmployeeTable.EMPLOYEE_DATABASE.value,
-        table_name=EmployeeTable.EMPLOYEE_TABLE.value
+        table_name=EmployeeTable.EMPLOYEE_TABLE.value,
+        key_col=EmployeeTable.EMPLOYEE_ID.value,
+        key_value=user_id
     )
-    if not rows:
-        print(f"No data found for table {EmployeeTable.EMPLOYEE_TABLE.value}")
-        return None
-
-    row = next((r for r in rows if str(r.get(EmployeeTable.EMPLOYEE_ID.value)) == str(user_id)), None)
     if not row:
         print(f"No data found for user_id {user_id}")
         return None
 
-    return row.get(field)
+    return row
 
 
-def main(user: UserProfile) -> CourseRecommendation:
-    user_id = str(user.user_id)
-    update_course = user.update or False
+def get_employee_field(user_id: str, field: str) -> Optional[str]:
+    """Lấy giá trị field của employee theo user_id"""
+    row = get_employee_row(user_id)
+    if not row:
+        return None
 
-    rows = get_data(
-        schema=EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
-        table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value
-    )
+    return row.get(field)
 
-    if not update_course and rows:
-        existing_row = next(
-            (r for r in rows if str(r.get(EmployeeCourse.EMPLOYEE_ID.value)) == user_id), None
-        )
-        if existing_row:
-            courses_data = existing_row[EmployeeCourse.COURSES.value]
-            if isinstance(courses_data, str):
-                courses_data = json.loads(courses_data)
-            return CourseRecommendation(courses=courses_data)
 
-    aspiration = get_employee_field(user_id, EmployeeTable.ASPIRATION.value)
-    current_skills_text = get_employee_field(user_id, EmployeeTable.CURRENT_SKILL.value)
-    skill_gaps_text = get_employee_field(user_id, EmployeeTable.SKILL_GAP.value)
+def parse_employee_profile(employee_row: Dict[str, Any]) -> Tuple[str, str, List[str], List[str]]:
+    """(aspiration, current_role, existing_skills, skill_gaps) from an employees row"""
+    aspiration = employee_row.get(EmployeeTable.ASPIRATION.value)
+    current_skills_text = employee_row.get(EmployeeTable.CURRENT_SKILL.value)
+    skill_gaps_text = employee_row.get(EmployeeTable.SKILL_GAP.value)
 
     if current_skills_text:
         parts = [p.strip() for p in current_skills_text.split(',') if p.strip()]
@@ -58,7 +48,53 @@ def main(user: UserProfile) -> CourseRecommendation:
         existing_skills = []
 
     skill_gaps = [s.strip() for s in skill_gaps_text.split(',')] if skill_gaps_text else []
+    return aspiration, current_role, existing_skills, skill_gaps
+
+
+def build_course_row(user_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """employee_courses row for a solve_course_recommendation result"""
+    course_names = [c["name"] for c in result["recommended_courses"]]
+    return {
+        EmployeeCourse.EMPLOYEE_ID.value: user_id,
+        EmployeeCourse.COURSES.value: json.dumps(course_names),
+        EmployeeCourse.COURSE_SKILL.value: json.dumps(result["skill_to_course_map"])
+    }
+
+
+ProgressCallback = Callable[[str, float], None]
+
+
+def _report(progress: Optional[ProgressCallback], stage: str, fraction: float) -> None:
+    if progress is not None:
+        progress(stage, fraction)
+
+
+def main(user: UserProfile, progress: Optional[ProgressCallback] = None) -> CourseRecommendation:
+    """
+    Recommend courses for a user. `progress(stage, fraction)` is called as
+    each step of the pipeline starts, for callers that report job status.
+    """
+    user_id = str(user.user_id)
+    update_course = user.update or False
+    _report(progress, "loading_profile", 0.0)
 
+    existing_row = get_by_key(
+        schema=EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
+        table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value,
+        key_col=EmployeeCourse.EMPLOYEE_ID.value,
+        key_value=user_id
+    )
+
+    if not update_course and existing_row:
+        courses_data = existing_row[EmployeeCourse.COURSES.value]
+        if isinstance(courses_data, str):
+            courses_data = json.loads(courses_data)
+        return CourseRecommendation(courses=courses_data)
+
+    employee_row = get_employee_row(user_id) or {}
+    aspiration, current_role, existing_skills, skill_gaps = parse_employee_profile(employee_row)
+
+    _report(progress, "mapping_skills", 0.1)
     skill_gap_result = map_skill(
         current_occupation=current_role,
         target_occupation=aspiration,
@@ -66,22 +102,18 @@ def main(user: UserProfile) -> CourseRecommendation:
         known_missing_skills=skill_gaps
     )
 
+    _report(progress, "embedding_skills", 0.4)
     embedded = embed_skills(skill_gap_result, aspiration)
 
+    _report(progress, "searching_courses", 0.6)
     result = solve_course_recommendation(
         skill_vectors=embedded,
         missing_skills=skill_gap_result
     )
     course_names = [c["name"] for c in result["recommended_courses"]]
-    skill_to_course = result["skill_to_course_map"]
-
-    row_data = {
-        EmployeeCourse.EMPLOYEE_ID.value: user_id,
-        EmployeeCourse.COURSES.value: json.dumps(course_names),
-        EmployeeCourse.COURSE_SKILL.value: json.dumps(skill_to_course)
-    }
+    row_data = build_course_row(user_id, result)
 
-    existing_row = next((r for r in rows if str(r.get(EmployeeCourse.EMPLOYEE_ID.value)) == user_id), None)
+    _report(progress, "saving", 0.9)
     if existing_row:
         update_data(
             data=[row_data], 
@@ -93,5 +125,6 @@ def main(user: UserProfile) -> CourseRecommendation:
         insert_employee_courses(
             data=[row_data],
         )
+    replace_entitlements({user_id: course_ids_from_result(result)})
 
     return CourseRecommendation(courses=course_names)
\ No newline at end of file
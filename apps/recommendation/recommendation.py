@@ -1,149 +1,259 @@
 import ast
-from typing import List, Dict
-from pymilvus import Collection
-from ortools.sat.python import cp_model
+import json
+from typing import List, Dict, Tuple
 from database.db import COURSERAMilvusFields
-from database.session import connect_milvus
+from database.milvus import get_milvus_manager
 from core.config import Settings
+from .set_cover import solve_set_cover
 
 # Load config settings
 recommendation = Settings().recommendation
 
+# Keeps hits sitting exactly on a threshold inside the range search despite float rounding
+RANGE_SEARCH_MARGIN = 1e-6
+# Courses per metadata query; keeps (course, skill) rows under Milvus' query result window
+DETAIL_BATCH_SIZE = 256
 
-def get_similar_courses(vector_skill, top_k=10000, threshold=None) -> List[Dict]:
+
+DETAIL_FIELDS = [
+    COURSERAMilvusFields.COURSE_ID.value,
+    COURSERAMilvusFields.COURSE_NAME.value,
+    COURSERAMilvusFields.COURSE_DESCRIPTION.value,
+    COURSERAMilvusFields.COURSE_SKILLS.value,
+    COURSERAMilvusFields.COURSE_LEVEL.value,
+    COURSERAMilvusFields.COURSE_FEEDBACK.value,
+]
+
+
+def _milvus_call(fn):
+    """Run fn(collection) on the shared, already-loaded course collection."""
+    return get_milvus_manager().call(fn, COURSERAMilvusFields.COLLECTION_NAME.value)
+
+
+def _parse_skills(raw_skills) -> List[str]:
+    try:
+        parsed_skills = (
+            ast.literal_eval(raw_skills)
+            if isinstance(raw_skills, str) and raw_skills.startswith("[")
+            else [raw_skills]
+        )
+        return [s.strip() for s in parsed_skills if isinstance(s, str) and s.strip()]
+    except Exception:
+        return []
+
+
+def fetch_course_details(course_ids: List[str]) -> Dict[str, Dict]:
     """
-    Find the most relevant courses based on a given similarity threshold.
+    Display fields of the given courses, DETAIL_BATCH_SIZE courses per Milvus query
+    (one query for a single recommendation). The collection holds one row per
+    (course, skill); skills are merged per course.
     """
-    threshold = threshold or recommendation.UPPER_THRESHOLD
-    collection = Collection(name=COURSERAMilvusFields.COLLECTION_NAME.value)
-    collection.load()
+    course_ids = list(dict.fromkeys(str(cid) for cid in course_ids if cid is not None))
+    if not course_ids:
+        return {}
+
+    rows = []
+    for start in range(0, len(course_ids), DETAIL_BATCH_SIZE):
+        chunk = course_ids[start:start + DETAIL_BATCH_SIZE]
+        expr = f"{COURSERAMilvusFields.COURSE_ID.value} in {json.dumps(chunk)}"
+        rows.extend(_milvus_call(lambda collection: collection.query(expr=expr, output_fields=DETAIL_FIELDS)))
+
+    details: Dict[str, Dict] = {}
+    for row in rows:
+        course_id = row.get(COURSERAMilvusFields.COURSE_ID.value)
+        course = details.get(course_id)
+        if course is None:
+            course = details[course_id] = {
+                "id": course_id,
+                "name": row.get(COURSERAMilvusFields.COURSE_NAME.value),
+                "description": row.get(COURSERAMilvusFields.COURSE_DESCRIPTION.value),
+                "skills": [],
+                "level": row.get(COURSERAMilvusFields.COURSE_LEVEL.value),
+                "feedback": row.get(COURSERAMilvusFields.COURSE_FEEDBACK.value),
+            }
+        for skill in _parse_skills(row.get(COURSERAMilvusFields.COURSE_SKILLS.value)):
+            if skill not in course["skills"]:
+                course["skills"].append(skill)
+    return details
 
+
+def _search_hits(vectors: List, top_k: int, threshold: float) -> List[List[Tuple[float, str]]]:
+    """
+    Range-search all vectors in one request (nq = len(vectors)).
+    Milvus only returns hits with similarity above `radius`, set just below
+    `threshold`; the exact >= threshold cut is applied here. Only course ids
+    come back; display fields are fetched later for the selected courses.
+    Result i holds (distance, course_id) for the hits of vectors[i].
+    """
     search_params = {
         "metric_type": "COSINE",
-        "params": {"nprobe": 10},
+        "params": {
+            "nprobe": 10,
+            # COSINE range search keeps hits with distance > radius
+            "radius": threshold - RANGE_SEARCH_MARGIN,
+        },
     }
 
-    results = collection.search(
-        data=[vector_skill],
+    results = _milvus_call(lambda collection: collection.search(
+        data=list(vectors),
         anns_field=COURSERAMilvusFields.EMBEDDING.value,
         param=search_params,
         limit=top_k,
-        output_fields=[
-            COURSERAMilvusFields.COURSE_ID.value,
-            COURSERAMilvusFields.COURSE_NAME.value,
-            COURSERAMilvusFields.COURSE_DESCRIPTION.value,
-            COURSERAMilvusFields.COURSE_SKILLS.value,
-            COURSERAMilvusFields.COURSE_LEVEL.value,
-            COURSERAMilvusFields.COURSE_FEEDBACK.value,
-        ],
-    )
-
-    top_results = []
-    for hits in results:
-        for hit in hits:
-            if hit.distance >= threshold:
-                try:
-                    raw_skills = hit.entity.get(COURSERAMilvusFields.COURSE_SKILLS.value)
-                    parsed_skills = (
-                        ast.literal_eval(raw_skills)
-                        if isinstance(raw_skills, str) and raw_skills.startswith("[")
-                        else raw_skills
-                    )
-                    course_skills = [s.strip() for s in parsed_skills if isinstance(s, str)]
-                except Exception:
-                    course_skills = []
-
-                top_results.append({
-                    "id": hit.entity.get(COURSERAMilvusFields.COURSE_ID.value),
-                    "name": hit.entity.get(COURSERAMilvusFields.COURSE_NAME.value),
-                    "description": hit.entity.get(COURSERAMilvusFields.COURSE_DESCRIPTION.value),
-                    "skills": course_skills,
-                    "level": hit.entity.get(COURSERAMilvusFields.COURSE_LEVEL.value),
-                    "feedback": hit.entity.get(COURSERAMilvusFields.COURSE_FEEDBACK.value),
-                    "similarity": round(hit.distance, 4),
-                })
-    return top_results
+        output_fields=[COURSERAMilvusFields.COURSE_ID.value],
+    ))
 
+    return [
+        [
+            (hit.distance, hit.entity.get(COURSERAMilvusFields.COURSE_ID.value))
+            for hit in hits if hit.distance >= threshold
+        ]
+        for hits in results
+    ]
 
-def solve_course_recommendation(skill_vectors: List, missing_skills: List[str]) -> Dict:
+
+def _best_per_course(hits: List[Tuple[float, str]]) -> List[Dict]:
+    best: Dict[str, float] = {}
+    for distance, course_id in hits:
+        if course_id not in best or distance > best[course_id]:
+            best[course_id] = distance
+    return [{"id": cid, "similarity": round(distance, 4)} for cid, distance in best.items()]
+
+
+def get_similar_courses(vector_skill, top_k=10000, threshold=None) -> List[Dict]:
     """
-    Optimize course selection to cover all missing skills with the minimal number of courses.
-    Dynamically adjusts similarity threshold from upper down to lower in steps.
+    Find the most relevant courses based on a given similarity threshold.
     """
-    connect_milvus()
+    threshold = threshold or recommendation.UPPER_THRESHOLD
+    matches = _best_per_course(_search_hits([vector_skill], top_k, threshold)[0])
+    details = fetch_course_details([match["id"] for match in matches])
+    return [{**details.get(match["id"], {"id": match["id"]}), **match} for match in matches]
 
-    skill_to_courses: Dict[str, set] = {}
-    all_courses: Dict[str, Dict] = {}
 
-    upper = recommendation.UPPER_THRESHOLD
-    lower = recommendation.LOWER_THRESHOLD
-    step = recommendation.STEP_THRESHOLD
+def _threshold_ladder() -> List[float]:
+    """UPPER_THRESHOLD, then lowered by STEP_THRESHOLD while still >= LOWER_THRESHOLD."""
+    thresholds = []
+    threshold = recommendation.UPPER_THRESHOLD
+    while threshold >= recommendation.LOWER_THRESHOLD:
+        thresholds.append(threshold)
+        threshold -= recommendation.STEP_THRESHOLD
+    return thresholds
+
 
-    for vector, skill in zip(skill_vectors, missing_skills):
-        threshold = upper
-        similar_courses = []
+def select_band(hits: List[Tuple[float, str]], ladder: List[float]) -> List[Dict]:
+    """
+    Courses ({"id", "similarity"}) of the highest non-empty similarity band:
+    the first threshold of the ladder that any hit reaches. A search does not
+    depend on the threshold, so banding one search's hits gives what
+    re-searching at each step did.
+    """
+    for threshold in ladder:
+        band = [(distance, course_id) for distance, course_id in hits if distance >= threshold]
+        if band:
+            return _best_per_course(band)
+    return []
 
-        # Dynamically lower the threshold until matches are found or hit lower bound
-        while threshold >= lower and not similar_courses:
-            similar_courses = get_similar_courses(vector, threshold=threshold)
-            if not similar_courses:
-                threshold -= step
 
+def search_skills_courses(vectors: List, top_k: int = 10000) -> List[List[Dict]]:
+    """
+    Courses matching each skill vector, SEARCH_BATCH_SIZE vectors per Milvus request.
+    One range search at the lowest rung of the ladder; bands are picked locally.
+    Empty vectors (failed embeddings) get no courses. Expects an open Milvus connection.
+    """
+    matches: List[List[Dict]] = [[] for _ in vectors]
+    ladder = _threshold_ladder()
+    if not ladder:
+        return matches
+
+    searchable = [i for i, vector in enumerate(vectors) if vector is not None and len(vector) > 0]
+    batch_size = max(1, recommendation.SEARCH_BATCH_SIZE)
+
+    for start in range(0, len(searchable), batch_size):
+        chunk = searchable[start:start + batch_size]
+        results = _search_hits([vectors[i] for i in chunk], top_k, ladder[-1])
+        for i, hits in zip(chunk, results):
+            matches[i] = select_band(hits, ladder)
+    return matches
+
+
+def search_skill_courses(vector_skill) -> List[Dict]:
+    """
+    Courses matching one skill vector. Expects an open Milvus connection.
+    """
+    return search_skills_courses([vector_skill])[0]
+
+
+def select_courses(missing_skills: List[str], skill_matches: Dict[str, List[Dict]]) -> Dict:
+    """
+    Pick the fewest courses that cover every missing skill, given the courses
+    matching each skill (keyed by lower-cased skill). Works on course ids only.
+    """
+    skill_to_courses: Dict[str, set] = {}
+    similarity: Dict[str, float] = {}
+
+    for skill in missing_skills:
+        skill_lc = skill.lower()
+        similar_courses = skill_matches.get(skill_lc)
         if not similar_courses:
+            print(f"No courses cover the skill: {skill_lc}")
             continue
 
-        skill_lc = skill.lower()
         skill_to_courses.setdefault(skill_lc, set())
 
         for course in similar_courses:
             course_id = course["id"]
-            all_courses[course_id] = course
+            similarity[course_id] = max(similarity.get(course_id, 0.0), course.get("similarity", 0.0))
             skill_to_courses[skill_lc].add(course_id)
 
-    # Build optimization model
-    course_list = list(all_courses.values())
-    course_id_to_index = {c["id"]: i for i, c in enumerate(course_list)}
-
-    missing_skills_lc = [s.lower() for s in missing_skills]
-    skill_index = {skill: idx for idx, skill in enumerate(missing_skills_lc)}
-
-    model = cp_model.CpModel()
-    course_vars = [model.NewBoolVar(f"course_{i}") for i in range(len(course_list))]
-    skill_covered = [model.NewBoolVar(f"skill_{i}") for i in range(len(missing_skills_lc))]
-
-    for skill, skill_idx in skill_index.items():
-        relevant_ids = skill_to_courses.get(skill, set())
-        relevant_vars = [course_vars[course_id_to_index[cid]] for cid in relevant_ids]
-        if relevant_vars:
-            model.AddMaxEquality(skill_covered[skill_idx], relevant_vars)
-            model.Add(skill_covered[skill_idx] == 1)
-        else:
-            print(f"No courses cover the skill: {skill}")
-
-    model.Minimize(sum(course_vars))
-
-    solver = cp_model.CpSolver()
-    status = solver.Solve(model)
-
-    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-        print("No optimal or feasible solution found.")
-        return {"recommended_courses": [], "skill_to_course_map": {}}
-
-    # Collect selected courses
-    selected_ids = {course_list[i]["id"] for i, var in enumerate(course_vars) if solver.Value(var)}
-    selected_courses = [c for c in course_list if c["id"] in selected_ids]
-
-    # Map skills to selected courses
-    final_skill_map = {
-        skill: [
-            all_courses[cid]["name"]
-            for cid in skill_to_courses.get(skill.lower(), set())
-            if cid in selected_ids
-        ]
-        for skill in missing_skills
+    coverage: Dict[str, set] = {}
+    for skill, course_ids in skill_to_courses.items():
+        for course_id in course_ids:
+            coverage.setdefault(course_id, set()).add(skill)
+
+    cover = solve_set_cover([s.lower() for s in missing_skills], coverage, priority=similarity)
+
+    selected_ids = cover["selected"]
+    selected = set(selected_ids)
+    return {
+        "selected_ids": selected_ids,
+        "skill_to_course_ids": {
+            skill: [cid for cid in skill_to_courses.get(skill.lower(), set()) if cid in selected]
+            for skill in missing_skills
+        },
+        "similarity": {cid: similarity[cid] for cid in selected_ids},
     }
 
+
+def build_recommendation(selection: Dict, details: Dict[str, Dict]) -> Dict:
+    """Attach display fields (from fetch_course_details) to a select_courses result."""
+    def course(cid: str) -> Dict:
+        return {**details.get(cid, {"id": cid, "name": None}), "similarity": selection["similarity"].get(cid)}
+
     return {
-        "recommended_courses": selected_courses,
-        "skill_to_course_map": final_skill_map,
+        "recommended_courses": [course(cid) for cid in selection["selected_ids"]],
+        "skill_to_course_map": {
+            skill: [details.get(cid, {}).get("name") for cid in cids]
+            for skill, cids in selection["skill_to_course_ids"].items()
+        },
     }
+
+
+def solve_from_matches(missing_skills: List[str], skill_matches: Dict[str, List[Dict]]) -> Dict:
+    """
+    Select the courses, then fetch display fields for just those courses.
+    """
+    selection = select_courses(missing_skills, skill_matches)
+    return build_recommendation(selection, fetch_course_details(selection["selected_ids"]))
+
+
+def solve_course_recommendation(skill_vectors: List, missing_skills: List[str]) -> Dict:
+    """
+    Optimize course selection to cover all missing skills with the minimal number of courses.
+    Each skill uses the highest similarity band (upper down to lower in steps) that has matches.
+    """
+    skill_matches: Dict[str, List[Dict]] = {}
+    skills = list(missing_skills[:len(skill_vectors)])
+    for skill, similar_courses in zip(skills, search_skills_courses(skill_vectors[:len(skills)])):
+        if similar_courses:
+            skill_matches.setdefault(skill.lower(), []).extend(similar_courses)
+
+    return solve_from_matches(missing_skills, skill_matches)
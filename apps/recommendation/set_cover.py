@@ -0,0 +1,200 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from core.config import Settings
+
+# Minimum set cover over course -> covered skills.
+# Coverage sets are bitmasks (one bit per skill). The problem is shrunk before
+# solving: identical sets keep one course, sets contained in another set are
+# dropped, and courses that are the only cover for some skill are forced in.
+# A greedy cover is returned directly when it meets a lower bound; otherwise it
+# seeds CP-SAT, which runs under a time limit.
+
+recommendation = Settings().recommendation
+
+# Rows per block of the dominance check, bounds the (block x courses) overlap matrix
+DOMINANCE_BLOCK = 1024
+
+
+def _bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _dedupe(coverage: Dict[str, int], priority: Dict[str, float]) -> Dict[int, str]:
+    """One course per distinct coverage set: the one with the highest priority."""
+    representative: Dict[int, str] = {}
+    for course_id, mask in coverage.items():
+        if not mask:
+            continue
+        best = representative.get(mask)
+        if best is None or priority.get(course_id, 0.0) > priority.get(best, 0.0):
+            representative[mask] = course_id
+    return representative
+
+
+def _undominated(masks: List[int], n_skills: int) -> List[int]:
+    """
+    Drop every set that is a strict subset of another one (sets are distinct).
+    Set i is inside set j when they share all |i| skills, computed block-wise
+    as a matrix product of the course x skill incidence matrix.
+    """
+    import numpy as np
+
+    if len(masks) < 2:
+        return masks
+
+    incidence = np.zeros((len(masks), n_skills), dtype=np.float32)
+    for row, mask in enumerate(masks):
+        incidence[row, list(_bits(mask))] = 1.0
+    sizes = incidence.sum(axis=1)
+
+    keep = np.ones(len(masks), dtype=bool)
+    for start in range(0, len(masks), DOMINANCE_BLOCK):
+        block = incidence[start:start + DOMINANCE_BLOCK]
+        rows = np.arange(len(block))
+        inside = (block @ incidence.T) == sizes[start:start + len(block), None]
+        inside[rows, start + rows] = False
+        keep[start:start + len(block)] = ~inside.any(axis=1)
+    return [mask for mask, kept in zip(masks, keep) if kept]
+
+
+def _greedy(masks: List[int], universe: int, priority: Dict[int, float]) -> List[int]:
+    """Repeatedly take the set covering the most uncovered skills."""
+    chosen = []
+    uncovered = universe
+    while uncovered:
+        best = max(masks, key=lambda m: ((m & uncovered).bit_count(), priority.get(m, 0.0)))
+        if not best & uncovered:
+            break
+        chosen.append(best)
+        uncovered &= ~best
+    return chosen
+
+
+def _lower_bound(masks: List[int], universe: int) -> int:
+    """
+    Largest of two bounds on any cover of `universe`:
+    - skills / largest set size;
+    - a set of skills no single course covers two of, each needing its own course.
+    """
+    if not universe:
+        return 0
+
+    largest = max((mask & universe).bit_count() for mask in masks)
+    size_bound = -(-universe.bit_count() // largest)
+
+    # skill -> bitmask over course indices
+    covers = {skill: 0 for skill in _bits(universe)}
+    for index, mask in enumerate(masks):
+        for skill in _bits(mask & universe):
+            covers[skill] |= 1 << index
+
+    independent = 0
+    used = 0
+    for skill in sorted(covers, key=lambda s: covers[s].bit_count()):
+        if not covers[skill] & used:
+            independent += 1
+            used |= covers[skill]
+    return max(size_bound, independent)
+
+
+def _cp_sat(
+    masks: List[int],
+    universe: int,
+    hint: List[int],
+    lower_bound: int,
+    time_limit: float,
+    workers: int
+) -> Tuple[Optional[List[int]], bool]:
+    """Exact cover with CP-SAT, hinted with and capped by the greedy cover. Returns (cover, optimal)."""
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    chosen = [model.NewBoolVar(f"course_{i}") for i in range(len(masks))]
+    for skill in _bits(universe):
+        model.AddBoolOr([var for var, mask in zip(chosen, masks) if mask >> skill & 1])
+
+    total = sum(chosen)
+    model.Add(total >= lower_bound)
+    model.Add(total <= len(hint))
+    model.Minimize(total)
+
+    hinted = set(hint)
+    for var, mask in zip(chosen, masks):
+        model.AddHint(var, mask in hinted)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_workers = workers
+    status = solver.Solve(model)
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None, False
+    return [mask for var, mask in zip(chosen, masks) if solver.Value(var)], status == cp_model.OPTIMAL
+
+
+def solve_set_cover(
+    skills: Iterable[str],
+    coverage: Dict[str, Set[str]],
+    priority: Optional[Dict[str, float]] = None,
+    time_limit: Optional[float] = None,
+    workers: Optional[int] = None
+) -> Dict:
+    """
+    Fewest courses from `coverage` (course id -> skills it covers) covering every
+    skill in `skills` that some course covers. Among equivalent courses the one
+    with the highest `priority` (e.g. similarity) is kept.
+
+    Returns {"selected": course ids, "optimal": bool, "solver": "greedy" | "cp_sat",
+    "lower_bound", "candidates", "reduced"}.
+    """
+    priority = priority or {}
+    time_limit = recommendation.SOLVER_TIME_LIMIT if time_limit is None else time_limit
+    workers = workers or recommendation.SOLVER_WORKERS
+
+    skill_bit = {skill: bit for bit, skill in enumerate(dict.fromkeys(skills))}
+    masks_by_course = {
+        course_id: sum(1 << skill_bit[s] for s in set(covered) if s in skill_bit)
+        for course_id, covered in coverage.items()
+    }
+
+    representative = _dedupe(masks_by_course, priority)
+    masks = _undominated(list(representative), len(skill_bit))
+    mask_priority = {mask: priority.get(representative[mask], 0.0) for mask in masks}
+
+    universe = 0
+    for mask in masks:
+        universe |= mask
+
+    # Courses that are the only cover of some skill belong to every cover
+    forced: List[int] = []
+    for skill in _bits(universe):
+        covering = [mask for mask in masks if mask >> skill & 1]
+        if len(covering) == 1 and covering[0] not in forced:
+            forced.append(covering[0])
+
+    residual = universe
+    for mask in forced:
+        residual &= ~mask
+    remaining = [mask for mask in masks if mask & residual and mask not in forced]
+
+    greedy = _greedy(remaining, residual, mask_priority)
+    lower_bound = _lower_bound(remaining, residual)
+
+    cover, optimal, solver = greedy, len(greedy) <= lower_bound, "greedy"
+    if not optimal:
+        exact, optimal = _cp_sat(remaining, residual, greedy, lower_bound, time_limit, workers)
+        if exact is not None:
+            cover, solver = exact, "cp_sat"
+        else:
+            print("⚠️ CP-SAT found no cover within the time limit; using the greedy cover.")
+
+    return {
+        "selected": [representative[mask] for mask in forced + cover],
+        "optimal": optimal,
+        "solver": solver,
+        "lower_bound": len(forced) + lower_bound,
+        "candidates": len(coverage),
+        "reduced": len(remaining),
+    }
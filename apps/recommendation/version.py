@@ -0,0 +1,61 @@
+import json
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional
+from database.db import EmployeeCourse, EmployeeTable
+from database.session import run_query
+from database.async_session import async_run_query
+
+# Per-user version stamp of everything the dashboard and skills-mapping
+# responses are built from: the aspiration and the employee_courses row.
+# The stamp is a digest of those rows, read on every request by primary key
+# without the process-local read cache, so any write on any replica changes
+# it immediately and writers have nothing to bump.
+
+_EMPLOYEE_QUERY = f'''
+    SELECT "{EmployeeTable.ASPIRATION.value}"
+    FROM "{EmployeeTable.EMPLOYEE_DATABASE.value}"."{EmployeeTable.EMPLOYEE_TABLE.value}"
+    WHERE "{EmployeeTable.EMPLOYEE_ID.value}" = :user_id
+    LIMIT 1
+'''
+_COURSE_QUERY = f'''
+    SELECT "{EmployeeCourse.COURSES.value}", "{EmployeeCourse.COURSE_SKILL.value}"
+    FROM "{EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value}"."{EmployeeCourse.EMPLOYEE_COURSE_TABLE.value}"
+    WHERE "{EmployeeCourse.EMPLOYEE_ID.value}" = :user_id
+    LIMIT 1
+'''
+
+
+def _stamp(employee_rows: List[Dict[str, Any]], course_rows: List[Dict[str, Any]]) -> Optional[str]:
+    # No stamp until recommendations exist: the first dashboard load still has to compute them.
+    if not employee_rows or not course_rows:
+        return None
+    payload = json.dumps([employee_rows[0], course_rows[0]], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def get_user_version(user_id: str) -> Optional[str]:
+    # No `tables`: run_query only caches reads that declare cached tables
+    params = {"user_id": str(user_id)}
+    return _stamp(run_query(_EMPLOYEE_QUERY, params), run_query(_COURSE_QUERY, params))
+
+
+async def get_user_version_async(user_id: str) -> Optional[str]:
+    params = {"user_id": str(user_id)}
+    employee_rows, course_rows = await asyncio.gather(
+        async_run_query(_EMPLOYEE_QUERY, params),
+        async_run_query(_COURSE_QUERY, params),
+    )
+    return _stamp(employee_rows, course_rows)
+
+
+def etag_for(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag == "*" or tag.removeprefix("W/") == etag for tag in candidates)
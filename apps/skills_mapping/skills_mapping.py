@@ -1,41 +1,57 @@
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
 from database.db import EmployeeCourse
 from schemas.skills_mapping_schema import UserProfile, SkillMappingResponse
-from database.session import get_data 
+from database.session import get_by_key
+from database.async_session import async_get_by_key
+
+
+def _build_mapping(user_row: Optional[dict]) -> SkillMappingResponse:
+    if not user_row:
+        return SkillMappingResponse(mappings={})
+
+    raw_course_skill = user_row.get(EmployeeCourse.COURSE_SKILL.value)
+    if not raw_course_skill:
+        return SkillMappingResponse(mappings={})
+
+    if isinstance(raw_course_skill, str):
+        course_skill_map: Dict[str, List[str]] = json.loads(raw_course_skill)
+    elif isinstance(raw_course_skill, dict):
+        course_skill_map: Dict[str, List[str]] = raw_course_skill
+    else:
+        return SkillMappingResponse(mappings={})
+
+    if not isinstance(course_skill_map, dict):
+        return SkillMappingResponse(mappings={})
+
+    return SkillMappingResponse(mappings=course_skill_map)
 
 
 def skills_mapping(user_profile: UserProfile) -> SkillMappingResponse:
     try:
-        data_rows = get_data(
+        user_row = get_by_key(
             schema=EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
-            table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value
-        )
-        if not data_rows:
-            return SkillMappingResponse(mappings={})
-
-        user_row = next(
-            (row for row in data_rows if row.get(EmployeeCourse.EMPLOYEE_ID.value) == user_profile.user_id),
-            None
+            table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value,
+            key_col=EmployeeCourse.EMPLOYEE_ID.value,
+            key_value=user_profile.user_id,
+            columns=[EmployeeCourse.COURSE_SKILL.value]
         )
-        if not user_row:
-            return SkillMappingResponse(mappings={})
+        return _build_mapping(user_row)
 
-        raw_course_skill = user_row.get(EmployeeCourse.COURSE_SKILL.value)
-        if not raw_course_skill:
-            return SkillMappingResponse(mappings={})
-
-        if isinstance(raw_course_skill, str):
-            course_skill_map: Dict[str, List[str]] = json.loads(raw_course_skill)
-        elif isinstance(raw_course_skill, dict):
-            course_skill_map: Dict[str, List[str]] = raw_course_skill
-        else:
-            return SkillMappingResponse(mappings={})
+    except Exception:
+        return SkillMappingResponse(mappings={})
 
-        if not isinstance(course_skill_map, dict):
-            return SkillMappingResponse(mappings={})
 
-        return SkillMappingResponse(mappings=course_skill_map)
+async def skills_mapping_async(user_profile: UserProfile) -> SkillMappingResponse:
+    try:
+        user_row = await async_get_by_key(
+            schema=EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
+            table_name=EmployeeCourse.EMPLOYEE_COURSE_TABLE.value,
+            key_col=EmployeeCourse.EMPLOYEE_ID.value,
+            key_value=user_profile.user_id,
+            columns=[EmployeeCourse.COURSE_SKILL.value]
+        )
+        return _build_mapping(user_row)
 
     except Exception:
         return SkillMappingResponse(mappings={})
@@ -59,6 +59,22 @@ class DataBase(BaseSettings):
     USER: str
     PASSWORD: str
     DATABASE: str
+    SSL_MODE: str = "require"
+    POOL_SIZE: int = 10
+    MAX_OVERFLOW: int = 5
+    POOL_TIMEOUT: int = 30
+    POOL_RECYCLE: int = 1800
+    BULK_BATCH_SIZE: int = 500
+    METADATA_TTL: int = 300
+    STREAM_CHUNK_SIZE: int = 1000
+    READ_CACHE_TTL: int = 60
+    READ_CACHE_MAXSIZE: int = 2048
+    READ_CACHE_TABLES: List[str] = [
+        "employees.employees",
+        "access_control_db.roles",
+        "access_control_db.user_roles",
+        "employee_course.course_entitlements",
+    ]
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -69,6 +85,7 @@ class DataBase(BaseSettings):
 class Milvus(BaseSettings):
     HOST: str
     PORT: str
+    CONNECT_TIMEOUT: float = 10.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -76,10 +93,40 @@ class Milvus(BaseSettings):
         extra="ignore"
     )
 
+class AuthSettings(BaseSettings):
+    BCRYPT_WORKERS: int = 4
+    BCRYPT_MAX_PENDING: int = 64
+    TOKEN_CACHE_TTL: int = 300
+    TOKEN_CACHE_MAXSIZE: int = 10000
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="AUTH_",
+        extra="ignore"
+    )
+
+class HealthSettings(BaseSettings):
+    PROBE_INTERVAL: float = 10.0
+    PROBE_TIMEOUT: float = 3.0
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="HEALTH_",
+        extra="ignore"
+    )
+
 class Recommendation(BaseSettings):
     UPPER_THRESHOLD: float = 0.95
     LOWER_THRESHOLD: float = 0.75
     STEP_THRESHOLD: float = 0.05
+    SEARCH_BATCH_SIZE: int = 16
+    JOB_WORKERS: int = 4
+    JOB_RESULT_TTL: int = 3600
+    JOB_STORE: str = "memory"
+    REFRESH_DEBOUNCE_SECONDS: float = 5.0
+    BATCH_WORKERS: int = 8
+    SOLVER_TIME_LIMIT: float = 2.0
+    SOLVER_WORKERS: int = 4
 
 class Settings(BaseSettings):
     coursera: CourseraSettings = CourseraSettings()
@@ -88,6 +135,8 @@ class Settings(BaseSettings):
     milvus: Milvus = Milvus()
     generate: GenerateSettings = GenerateSettings()
     recommendation: Recommendation = Recommendation()
+    auth: AuthSettings = AuthSettings()
+    health: HealthSettings = HealthSettings()
 
     model_config = SettingsConfigDict(
         env_file=".env",
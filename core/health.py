@@ -0,0 +1,100 @@
+import time
+import asyncio
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import text
+from core.config import Settings
+from database.db import COURSERAMilvusFields
+
+health_settings = Settings().health
+
+
+def _ping_database() -> None:
+    from database.session import get_db
+
+    with get_db() as session:
+        session.execute(text("SELECT 1"))
+
+
+def _ping_milvus() -> None:
+    from pymilvus import utility
+    from database.milvus import get_milvus_manager
+
+    manager = get_milvus_manager()
+    name = COURSERAMilvusFields.COLLECTION_NAME.value
+    if not manager.call(lambda: utility.has_collection(name, using=manager.alias)):
+        raise RuntimeError(f"collection '{COURSERAMilvusFields.COLLECTION_NAME.value}' not found")
+
+
+class HealthMonitor:
+    """
+    Probes dependencies on a background task and keeps the last result,
+    so /readyz only reads a dict instead of touching Postgres or Milvus.
+    A result older than three intervals counts as not ready.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.checks: Dict[str, Callable[[], None]] = {
+            "postgres": _ping_database,
+            "milvus": _ping_milvus,
+        }
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.started_at = time.time()
+
+    async def _run_check(self, name: str, check: Callable[[], None]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(check), timeout=self.timeout)
+            result = {"ok": True}
+        except asyncio.TimeoutError:
+            result = {"ok": False, "error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        if not result["ok"]:
+            print(f"⚠️ Readiness check '{name}' failed: {result['error']}")
+        return result
+
+    async def probe(self) -> None:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._run_check(name, self.checks[name]) for name in names))
+        self._results = dict(zip(names, results))
+        self._checked_at = time.time()
+
+    async def _loop(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def readiness(self) -> Dict[str, Any]:
+        now = time.time()
+        fresh = self._checked_at is not None and now - self._checked_at <= self.interval * 3
+        ready = fresh and bool(self._results) and all(r["ok"] for r in self._results.values())
+        return {
+            "ready": ready,
+            "checked_at": self._checked_at,
+            "age_seconds": round(now - self._checked_at, 3) if self._checked_at is not None else None,
+            "checks": self._results,
+        }
+
+
+health_monitor = HealthMonitor(
+    interval=health_settings.PROBE_INTERVAL,
+    timeout=health_settings.PROBE_TIMEOUT
+)
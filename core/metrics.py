@@ -0,0 +1,261 @@
+import time
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Minimal Prometheus text-format registry; no client library needed.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+DEPENDENCIES = ("postgres", "milvus", "gemini", "coursera")
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Sample lines of this metric in Prometheus text format."""
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = _format_value(float(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, prefix: str, collect: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Expose the numeric values of a stats dict (pool, cache, login stats...)
+        as gauges named {prefix}_{key}, read at scrape time.
+        """
+        with self._lock:
+            self._collectors.append((prefix, collect))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        for prefix, collect in collectors:
+            try:
+                stats = collect()
+            except Exception as e:
+                print(f"⚠️ Metrics collector '{prefix}' failed: {e}")
+                continue
+            for key, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{prefix}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")
+))
+HTTP_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route")
+))
+HTTP_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ("method", "route")
+))
+REQUEST_DEPENDENCY_CALLS = registry.register(Histogram(
+    "http_request_dependency_calls", "Outbound calls made while serving one request.",
+    ("route", "dependency"), buckets=COUNT_BUCKETS
+))
+REQUEST_DEPENDENCY_SECONDS = registry.register(Histogram(
+    "http_request_dependency_seconds", "Time spent in outbound calls while serving one request.",
+    ("route", "dependency")
+))
+DEPENDENCY_CALLS = registry.register(Counter(
+    "dependency_calls_total", "Outbound calls by dependency and outcome.", ("dependency", "outcome")
+))
+DEPENDENCY_LATENCY = registry.register(Histogram(
+    "dependency_call_duration_seconds", "Latency of single outbound calls.", ("dependency",)
+))
+
+
+class _RequestCalls:
+    """Per-request tally. Shared by reference, so worker threads that copy the context still add to it."""
+
+    __slots__ = ("calls", "seconds")
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+
+
+_request_calls: ContextVar[Optional[_RequestCalls]] = ContextVar("request_calls", default=None)
+_tally_lock = threading.Lock()
+
+
+def record_dependency_call(dependency: str, seconds: float, ok: bool = True) -> None:
+    DEPENDENCY_CALLS.inc(dependency=dependency, outcome="ok" if ok else "error")
+    DEPENDENCY_LATENCY.observe(seconds, dependency=dependency)
+
+    tally = _request_calls.get()
+    if tally is not None:
+        with _tally_lock:
+            tally.calls[dependency] = tally.calls.get(dependency, 0) + 1
+            tally.seconds[dependency] = tally.seconds.get(dependency, 0.0) + seconds
+
+
+@contextmanager
+def track_dependency(dependency: str) -> Iterator[None]:
+    """
+    Time an outbound call and attribute it to the current request, if any.
+    """
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        record_dependency_call(dependency, time.perf_counter() - started, ok)
+
+
+def start_request() -> Tuple[_RequestCalls, Any]:
+    tally = _RequestCalls()
+    return tally, _request_calls.set(tally)
+
+
+def finish_request(tally: _RequestCalls, token: Any, route: str) -> None:
+    _request_calls.reset(token)
+    for dependency in DEPENDENCIES:
+        REQUEST_DEPENDENCY_CALLS.observe(tally.calls.get(dependency, 0), route=route, dependency=dependency)
+        REQUEST_DEPENDENCY_SECONDS.observe(tally.seconds.get(dependency, 0.0), route=route, dependency=dependency)
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,127 @@
+"""
+Worker startup benchmark: import time and baseline RSS of `import main`.
+
+    python -m core.startup --runs 5 --top 15
+
+Each run imports the app in a fresh interpreter, like a new worker would.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List, Tuple
+
+# Modules that should only be loaded by the code paths that use them.
+LAZY_MODULES = [
+    "google.genai",
+    "google.generativeai",
+    "ortools",
+    "pymilvus",
+    "pandas",
+    "numpy",
+    "bs4",
+    "langdetect",
+]
+
+_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+
+rss_kb = None
+try:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+                break
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+lazy = %r
+print(json.dumps({
+    "import_seconds": elapsed,
+    "rss_mb": round(rss_kb / 1024, 1) if rss_kb else None,
+    "modules": len(sys.modules),
+    "eager_heavy_modules": [m for m in lazy if m in sys.modules],
+}))
+"""
+
+
+def _project_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(importtime: bool = False) -> Tuple[Dict[str, Any], str]:
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", _PROBE % (LAZY_MODULES,)]
+
+    proc = subprocess.run(cmd, cwd=_project_root(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def slowest_imports(importtime_log: str, top: int) -> List[Tuple[int, str]]:
+    """Top-level packages by cumulative import time (microseconds) from -X importtime output."""
+    totals: Dict[str, int] = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1].strip())
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        if name.startswith(" ") and not name.startswith("  "):
+            package = name.strip()
+            totals[package] = max(totals.get(package, 0), cumulative)
+    return sorted(((us, name) for name, us in totals.items()), reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark worker startup (import main).")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="show the N slowest top-level imports")
+    parser.add_argument("--max-import-seconds", type=float, default=None,
+                        help="exit non-zero if the median import time exceeds this")
+    args = parser.parse_args()
+
+    results = [run_once()[0] for _ in range(args.runs)]
+    times = [r["import_seconds"] for r in results]
+    rss = [r["rss_mb"] for r in results if r["rss_mb"] is not None]
+
+    median_time = statistics.median(times)
+    print(f"import main: median {median_time:.3f}s, min {min(times):.3f}s, max {max(times):.3f}s "
+          f"over {len(times)} runs")
+    if rss:
+        print(f"baseline RSS: median {statistics.median(rss):.1f} MB")
+    print(f"modules loaded: {results[-1]['modules']}")
+
+    eager = results[-1]["eager_heavy_modules"]
+    if eager:
+        print(f"⚠️ heavy modules imported at startup: {', '.join(eager)}")
+    else:
+        print("✅ no heavy modules imported at startup")
+
+    if args.top:
+        _, log = run_once(importtime=True)
+        print(f"\nslowest top-level imports:")
+        for us, name in slowest_imports(log, args.top):
+            print(f"  {us / 1000:8.1f} ms  {name}")
+
+    if args.max_import_seconds is not None and median_time > args.max_import_seconds:
+        print(f"❌ median import time {median_time:.3f}s exceeds {args.max_import_seconds}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+-- Courses each employee may act on (currently recommended courses).
+-- Written by apps/recommendation/entitlements.replace_entitlements.
+CREATE TABLE IF NOT EXISTS employee_course.course_entitlements (
+    employee_id TEXT NOT NULL,
+    course_id   TEXT NOT NULL,
+    PRIMARY KEY (employee_id, course_id)
+);
+
+-- Backfill from existing recommendations (course names -> ids)
+INSERT INTO employee_course.course_entitlements (employee_id, course_id)
+SELECT DISTINCT ec.employee_id::text, c.id::text
+FROM employee_course.employee_courses AS ec
+CROSS JOIN LATERAL json_array_elements_text(ec.courses::json) AS rec(name)
+JOIN course.courses AS c ON c.name = rec.name
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,4 @@
+-- Indexes backing the keyed lookups in database/session.py
+CREATE INDEX IF NOT EXISTS idx_user_roles_user_id ON access_control_db.user_roles (user_id);
+CREATE INDEX IF NOT EXISTS idx_users_username ON access_control_db.users (username);
+CREATE INDEX IF NOT EXISTS idx_courses_name ON course.courses (name);
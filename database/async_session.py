@@ -0,0 +1,210 @@
+from typing import List, Dict, Any, Optional, Tuple
+from contextlib import asynccontextmanager
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from database.session import (
+    settings,
+    instrument_engine,
+    _COLUMNS_QUERY,
+    _identifier,
+    _filter_spec,
+    _select_statement,
+    _projection,
+    _cached_table_metadata,
+    _store_table_metadata,
+    _MISS,
+    _read_cache_key,
+    _read_cache_get,
+    _read_cache_put,
+    _read_cache_snapshot,
+    _read_cache,
+    _query_statement,
+    _query_cache_key,
+)
+
+# ====== SHARED ASYNC ENGINE & POOL ======
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+
+def get_async_db_url() -> str:
+    db_settings = settings.database
+    return (
+        f"postgresql+psycopg://{db_settings.USER}:{db_settings.PASSWORD}"
+        f"@{db_settings.ENDPOINT}:{db_settings.PORT}/{db_settings.DATABASE}"
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the process-wide async engine (psycopg 3), creating it on first use.
+    It has its own pool, sized like the sync one.
+    """
+    global _async_engine, _AsyncSessionLocal
+
+    if _async_engine is None:
+        db_settings = settings.database
+        _async_engine = create_async_engine(
+            get_async_db_url(),
+            pool_pre_ping=True,
+            pool_size=db_settings.POOL_SIZE,
+            max_overflow=db_settings.MAX_OVERFLOW,
+            pool_timeout=db_settings.POOL_TIMEOUT,
+            pool_recycle=db_settings.POOL_RECYCLE,
+            connect_args={"sslmode": db_settings.SSL_MODE},
+            echo=False
+        )
+        instrument_engine(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+@asynccontextmanager
+async def get_async_db(schema: Optional[str] = None):
+    get_async_engine()
+    async with _AsyncSessionLocal() as db_session:
+        try:
+            if schema:
+                await db_session.execute(text(f'SET LOCAL search_path TO "{schema}"'))
+            yield db_session
+        except Exception:
+            await db_session.rollback()
+            raise
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _AsyncSessionLocal
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
+
+
+def get_async_pool_stats() -> Dict[str, Any]:
+    if _async_engine is None:
+        return {"initialized": False}
+
+    pool = _async_engine.pool
+    return {
+        "initialized": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+    }
+
+
+async def _load_table_metadata_async(schema: str, table_name: str, session):
+    entry = _cached_table_metadata(schema, table_name)
+    if entry is not None:
+        return entry
+
+    result = await session.execute(_COLUMNS_QUERY, {"schema": schema, "table": table_name})
+    return _store_table_metadata(schema, table_name, tuple(row[0] for row in result.fetchall()))
+
+
+async def async_get_data(
+    schema: str,
+    table_name: str,
+    columns: Optional[List[str]] = None
+) -> Optional[List[Dict[str, Any]]]:
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
+    projection = _projection(columns)
+
+    cache_key = _read_cache_key("data", schema, table_name, columns=projection)
+    cached = _read_cache_get(cache_key)
+    if cached is not _MISS:
+        return cached
+    snapshot = _read_cache_snapshot(cache_key)
+
+    async with get_async_db(schema) as session:
+        entry = await _load_table_metadata_async(schema, table_name, session)
+        if entry[1] is None:
+            _read_cache_put(cache_key, None, snapshot)
+            return None
+
+        result = await session.execute(_select_statement(schema, table_name, (), False, projection))
+        columns = result.keys()
+        data = [dict(zip(columns, row)) for row in result.fetchall()]
+
+    _read_cache_put(cache_key, data, snapshot)
+    return data
+
+
+async def async_get_where(
+    schema: str,
+    table_name: str,
+    filters: Dict[Any, Any],
+    limit: Optional[int] = None,
+    columns: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of database.session.get_where.
+    """
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
+    spec, params = _filter_spec(filters)
+    if limit is not None:
+        params["_limit"] = int(limit)
+    projection = _projection(columns)
+
+    cache_key = _read_cache_key("where", schema, table_name, spec, params, projection)
+    cached = _read_cache_get(cache_key)
+    if cached is not _MISS:
+        return cached
+    snapshot = _read_cache_snapshot(cache_key)
+
+    query = _select_statement(schema, table_name, spec, limit is not None, projection)
+
+    async with get_async_db(schema) as session:
+        result = await session.execute(query, params)
+        columns = result.keys()
+        rows = [dict(zip(columns, row)) for row in result.fetchall()]
+
+    _read_cache_put(cache_key, rows, snapshot)
+    return rows
+
+
+async def async_get_by_key(
+    schema: str,
+    table_name: str,
+    key_col: str,
+    key_value: Any,
+    columns: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Async counterpart of database.session.get_by_key.
+    """
+    rows = await async_get_where(schema, table_name, {key_col: key_value}, limit=1, columns=columns)
+    return rows[0] if rows else None
+
+
+async def async_run_query(
+    sql: str,
+    params: Optional[Dict[str, Any]] = None,
+    tables: Optional[List[Tuple[str, str]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of database.session.run_query.
+    """
+    params = params or {}
+    tags = tuple((_identifier(schema), _identifier(table)) for schema, table in (tables or []))
+
+    cache_key = _query_cache_key(sql, params, tags)
+    if cache_key is not None:
+        cached = _read_cache.get(cache_key, _MISS)
+        if cached is not _MISS:
+            return [dict(row) for row in cached]
+        snapshot = _read_cache.snapshot(tags)
+
+    async with get_async_db() as session:
+        result = await session.execute(_query_statement(sql), params)
+        columns = result.keys()
+        rows = [dict(zip(columns, row)) for row in result.fetchall()]
+
+    if cache_key is not None:
+        _read_cache.set(cache_key, [dict(row) for row in rows], tags=tags, snapshot=snapshot)
+    return rows
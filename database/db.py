@@ -84,4 +84,10 @@ class EmployeeCourse(str, Enum):
     EMPLOYEE_COURSE_TABLE = "employee_courses"
     EMPLOYEE_ID = "employee_id"
     COURSES = "courses"
-    COURSE_SKILL = "course_skill"
\ No newline at end of file
+    COURSE_SKILL = "course_skill"
+
+class CourseEntitlement(str, Enum):
+    ENTITLEMENT_DATABASE = "employee_course"
+    ENTITLEMENT_TABLE = "course_entitlements"
+    EMPLOYEE_ID = "employee_id"
+    COURSE_ID = "course_id"
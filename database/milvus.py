@@ -0,0 +1,163 @@
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+from core.config import Settings
+from core.metrics import track_dependency
+
+T = TypeVar("T")
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """
+    Errors worth one retry on a fresh connection: the channel is gone, the
+    server is unavailable, or the collection was released (e.g. Milvus restarted).
+    """
+    from pymilvus.exceptions import ConnectError, ConnectionNotExistException, MilvusUnavailableException
+
+    if isinstance(error, (ConnectError, ConnectionNotExistException, MilvusUnavailableException)):
+        return True
+    try:
+        import grpc
+        if isinstance(error, grpc.RpcError) and error.code() == grpc.StatusCode.UNAVAILABLE:
+            return True
+    except ImportError:
+        pass
+    return "not loaded" in str(error).lower()
+
+
+class MilvusManager:
+    """
+    Process-wide Milvus connection and Collection handles for one alias.
+
+    The connection is opened once; Collection handles are cached and load()
+    is only issued when Milvus reports the collection is not loaded. call()
+    runs an operation and, on a connection error, reconnects and retries once.
+    State changes happen under a lock, so threadpool workers can share it.
+    """
+
+    def __init__(self, alias: str = "default"):
+        self.alias = alias
+        self._lock = threading.RLock()
+        self._connected = False
+        self._collections: Dict[str, Any] = {}
+        # Bumped on every reset, so concurrent failures of the same connection reconnect once
+        self._generation = 0
+        self._stats = {"connects": 0, "resets": 0, "loads": 0, "retries": 0}
+
+    def connect(self) -> None:
+        if self._connected:
+            return
+        with self._lock:
+            if self._connected:
+                return
+            from pymilvus import connections
+
+            milvus_settings = Settings().milvus
+            with track_dependency("milvus"):
+                connections.connect(
+                    alias=self.alias,
+                    host=milvus_settings.HOST,
+                    port=milvus_settings.PORT,
+                    timeout=milvus_settings.CONNECT_TIMEOUT,
+                )
+            self._connected = True
+            self._stats["connects"] += 1
+
+    def get_collection(self, name: str):
+        collection = self._collections.get(name)
+        if collection is not None:
+            return collection
+
+        self.connect()
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = self._open_collection(name)
+        return collection
+
+    def _open_collection(self, name: str):
+        from pymilvus import Collection, utility
+        from pymilvus.client.types import LoadState
+
+        with track_dependency("milvus"):
+            collection = Collection(name=name, using=self.alias)
+            if utility.load_state(name, using=self.alias) != LoadState.Loaded:
+                collection.load()
+                self._stats["loads"] += 1
+        return collection
+
+    def forget(self, name: str) -> None:
+        """Drop a cached handle, e.g. after the collection was dropped or recreated."""
+        with self._lock:
+            self._collections.pop(name, None)
+
+    def reset(self, generation: Optional[int] = None) -> None:
+        """
+        Close the connection and drop all handles; the next call reconnects.
+        With `generation`, only resets if nobody has reset since it was read.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._generation += 1
+            self._collections.clear()
+            if self._connected:
+                from pymilvus import connections
+                try:
+                    connections.disconnect(self.alias)
+                except Exception as e:
+                    print(f"⚠️ Milvus disconnect failed: {e}")
+                self._connected = False
+                self._stats["resets"] += 1
+
+    def call(self, fn: Callable[..., T], collection: Optional[str] = None) -> T:
+        """
+        Run `fn(handle)` for the named collection, or `fn()` without one.
+        On a connection error the manager reconnects and retries once.
+        """
+        for attempt in range(2):
+            generation = self._generation
+            try:
+                # Also for collection-less calls (utility.*), which need the alias connected
+                self.connect()
+                handle = self.get_collection(collection) if collection else None
+                with track_dependency("milvus"):
+                    return fn(handle) if collection else fn()
+            except Exception as e:
+                if attempt or not _is_connection_error(e):
+                    raise
+                print(f"⚠️ Milvus call failed, reconnecting: {e}")
+                with self._lock:
+                    self._stats["retries"] += 1
+                self.reset(generation)
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "connected": int(self._connected),
+                "collections": len(self._collections),
+                **self._stats,
+            }
+
+
+_managers: Dict[str, MilvusManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_milvus_manager(alias: str = "default") -> MilvusManager:
+    manager = _managers.get(alias)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.setdefault(alias, MilvusManager(alias))
+    return manager
+
+
+def get_milvus_stats() -> Dict[str, Any]:
+    return get_milvus_manager().stats()
+
+
+def close_milvus() -> None:
+    with _managers_lock:
+        managers = list(_managers.values())
+    for manager in managers:
+        manager.reset()
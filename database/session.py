@@ -1,119 +1,733 @@
-from typing import List, Dict, Any, Optional
-from sqlalchemy import create_engine, text
+import time
+import threading
+from enum import Enum
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet, Iterator, Callable
+from sqlalchemy import create_engine, text, bindparam, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
 from core.config import Settings
-from pymilvus import connections, Collection
+from core.cache import TTLCache
+from core.metrics import record_dependency_call
 from database.db import EmployeeCourse
 
 settings = Settings()
 
+# ====== SHARED ENGINE & POOL ======
+_engine: Optional[Engine] = None
+_SessionLocal: Optional[sessionmaker] = None
+_engine_lock = threading.Lock()
 
-def get_data(schema: str, table_name: str) -> Optional[List[Dict[str, Any]]]:
-    db_settings = settings.database
 
-    db_url = (
+def get_db_url() -> str:
+    db_settings = settings.database
+    return (
         f"postgresql+psycopg2://{db_settings.USER}:{db_settings.PASSWORD}"
         f"@{db_settings.ENDPOINT}:{db_settings.PORT}/{db_settings.DATABASE}"
     )
 
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if started:
+        record_dependency_call("postgres", time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if started:
+        record_dependency_call("postgres", time.perf_counter() - started.pop(), ok=False)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Count and time every statement sent to Postgres through this engine.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _create_engine_locked() -> Tuple[Engine, sessionmaker]:
+    """
+    Build the engine and its sessionmaker if needed; caller holds _engine_lock.
+    _SessionLocal is published before _engine, so a reader that sees the engine
+    on the unlocked fast path also sees the sessionmaker.
+    """
+    global _engine, _SessionLocal
+
+    if _engine is not None and _SessionLocal is not None:
+        return _engine, _SessionLocal
+
+    db_settings = settings.database
+    engine = create_engine(
+        get_db_url(),
+        pool_pre_ping=True,
+        pool_size=db_settings.POOL_SIZE,
+        max_overflow=db_settings.MAX_OVERFLOW,
+        pool_timeout=db_settings.POOL_TIMEOUT,
+        pool_recycle=db_settings.POOL_RECYCLE,
+        connect_args={"sslmode": db_settings.SSL_MODE},
+        echo=False
+    )
+    instrument_engine(engine)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    _SessionLocal = session_factory
+    _engine = engine
+    return engine, session_factory
+
+
+def get_engine() -> Engine:
+    """
+    Return the process-wide engine, creating it (and its pool) on first use.
+    """
+    engine = _engine
+    if engine is not None:
+        return engine
+
+    with _engine_lock:
+        return _create_engine_locked()[0]
+
+
+def _get_session_factory() -> sessionmaker:
+    session_factory = _SessionLocal
+    if session_factory is not None:
+        return session_factory
+
+    with _engine_lock:
+        return _create_engine_locked()[1]
+
+
+@contextmanager
+def get_db(schema: Optional[str] = None):
+    """
+    Yield a session bound to the shared engine, optionally scoped to a schema.
+    The connection goes back to the pool when the block exits.
+    """
+    db_session = _get_session_factory()()
     try:
-        engine = create_engine(
-            db_url,
-            pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=5,
-            connect_args={"sslmode": "require"},
-            echo=False
-        )
+        if schema:
+            db_session.execute(text(f'SET LOCAL search_path TO "{schema}"'))
+        yield db_session
+    except Exception:
+        db_session.rollback()
+        raise
+    finally:
+        db_session.close()
+
+
+def dispose_engine() -> None:
+    """
+    Close every pooled connection. Called on application shutdown.
+    """
+    global _engine, _SessionLocal
+
+    with _engine_lock:
+        engine = _engine
+        if engine is not None:
+            # Unpublish in the reverse order of _create_engine_locked
+            _engine = None
+            _SessionLocal = None
+            engine.dispose()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Snapshot of the shared connection pool.
+    """
+    engine = _engine
+    if engine is None:
+        return {"initialized": False}
+
+    pool = engine.pool
+    return {
+        "initialized": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+    }
+
+
+# ====== SCHEMA METADATA CACHE ======
+# (schema, table) -> (expires_at, ordered columns, column set); columns are None if the table is missing.
+_table_metadata: Dict[Tuple[str, str], Tuple[float, Optional[Tuple[str, ...]], Optional[FrozenSet[str]]]] = {}
+_metadata_lock = threading.Lock()
+
+_COLUMNS_QUERY = text("""
+    SELECT column_name
+    FROM information_schema.columns
+    WHERE table_schema = :schema AND table_name = :table
+    ORDER BY ordinal_position
+""")
+
+
+def _identifier(name: Any) -> str:
+    """Plain string for a schema/table/column name, unwrapping enum members."""
+    return name.value if isinstance(name, Enum) else str(name)
+
+
+def _cached_table_metadata(schema: str, table_name: str):
+    entry = _table_metadata.get((schema, table_name))
+    if entry is not None and entry[0] > time.monotonic():
+        return entry
+    return None
+
+
+def _store_table_metadata(schema: str, table_name: str, columns: Tuple[str, ...]):
+    entry = (
+        time.monotonic() + settings.database.METADATA_TTL,
+        columns or None,
+        frozenset(columns) or None,
+    )
+    with _metadata_lock:
+        _table_metadata[(schema, table_name)] = entry
+    return entry
+
+
+def _load_table_metadata(schema: str, table_name: str, session=None):
+    entry = _cached_table_metadata(schema, table_name)
+    if entry is not None:
+        return entry
+
+    params = {"schema": schema, "table": table_name}
+    if session is None:
+        with get_db() as own_session:
+            rows = own_session.execute(_COLUMNS_QUERY, params).fetchall()
+    else:
+        rows = session.execute(_COLUMNS_QUERY, params).fetchall()
+
+    return _store_table_metadata(schema, table_name, tuple(row[0] for row in rows))
+
+
+def get_table_columns(schema: str, table_name: str) -> Optional[Tuple[str, ...]]:
+    """
+    Column names of a table in ordinal order, or None if the table does not exist.
+    Served from the per-process metadata cache (RDS_METADATA_TTL seconds).
+    """
+    return _load_table_metadata(_identifier(schema), _identifier(table_name))[1]
+
+
+def invalidate_table_metadata(schema: Optional[str] = None, table_name: Optional[str] = None) -> None:
+    """
+    Drop cached metadata for one table, one schema, or everything (e.g. after a migration).
+    Cached statement text is dropped along with it.
+    """
+    with _metadata_lock:
+        if schema is None:
+            _table_metadata.clear()
+        else:
+            schema = _identifier(schema)
+            table_name = _identifier(table_name) if table_name is not None else None
+            for key in list(_table_metadata):
+                if key[0] == schema and (table_name is None or key[1] == table_name):
+                    del _table_metadata[key]
+
+    _select_statement.cache_clear()
+    _upsert_statement.cache_clear()
+    _update_statement.cache_clear()
+    _staging_statements.cache_clear()
+    _staging_insert_statement.cache_clear()
+
+
+# ====== STATEMENT CACHE ======
+def _filter_spec(filters: Dict[Any, Any]) -> Tuple[Tuple[Tuple[str, str], ...], Dict[str, Any]]:
+    """
+    Split {column: value} into a hashable shape and its bound parameters.
+    List-like values become an IN (...) match, None becomes IS NULL.
+    """
+    spec = []
+    params: Dict[str, Any] = {}
+
+    for idx, (col, value) in enumerate(filters.items()):
+        key = f"p{idx}"
+        if isinstance(value, (list, tuple, set, frozenset)):
+            spec.append((_identifier(col), "in"))
+            params[key] = list(value)
+        elif value is None:
+            spec.append((_identifier(col), "null"))
+        else:
+            spec.append((_identifier(col), "eq"))
+            params[key] = value
+
+    return tuple(spec), params
+
+
+def _projection(columns: Optional[List[Any]]) -> Optional[Tuple[str, ...]]:
+    return tuple(_identifier(col) for col in columns) if columns else None
+
+
+@lru_cache(maxsize=512)
+def _select_statement(
+    schema: str,
+    table_name: str,
+    spec: Tuple[Tuple[str, str], ...],
+    limited: bool,
+    columns: Optional[Tuple[str, ...]] = None
+) -> TextClause:
+    clauses = []
+    expanding = []
+
+    for idx, (col, kind) in enumerate(spec):
+        key = f"p{idx}"
+        if kind == "in":
+            clauses.append(f'"{col}" IN :{key}')
+            expanding.append(key)
+        elif kind == "null":
+            clauses.append(f'"{col}" IS NULL')
+        else:
+            clauses.append(f'"{col}" = :{key}')
+
+    columns_str = ', '.join(f'"{col}"' for col in columns) if columns else "*"
+    query_str = f'SELECT {columns_str} FROM "{schema}"."{table_name}"'
+    if clauses:
+        query_str += " WHERE " + " AND ".join(clauses)
+    if limited:
+        query_str += " LIMIT :_limit"
+
+    query = text(query_str)
+    if expanding:
+        query = query.bindparams(*[bindparam(key, expanding=True) for key in expanding])
+    return query
+
+
+def _values_placeholders(n_cols: int, n_rows: int) -> str:
+    return ', '.join(
+        "(" + ', '.join(f":c{j}_{i}" for j in range(n_cols)) + ")"
+        for i in range(n_rows)
+    )
+
+
+def _require_same_columns(columns: List[str], rows: List[Dict[str, Any]]) -> None:
+    """
+    A multi-row VALUES list binds the same columns for every row; a row missing
+    one would silently write NULL (and overwrite through EXCLUDED on upsert).
+    """
+    expected = set(columns)
+    for i, row in enumerate(rows):
+        if row.keys() != expected:
+            raise ValueError(
+                f"Row {i} sets columns {sorted(row.keys())}, expected {sorted(expected)}: "
+                f"every row of a bulk write must set the same columns"
+            )
+
+
+def _values_params(columns: List[str], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        f"c{j}_{i}": row[col]
+        for i, row in enumerate(rows)
+        for j, col in enumerate(columns)
+    }
+
+
+@lru_cache(maxsize=512)
+def _upsert_statement(
+    schema: str,
+    table_name: str,
+    columns: Tuple[str, ...],
+    conflict_cols: Tuple[str, ...],
+    n_rows: int
+) -> TextClause:
+    columns_str = ', '.join(f'"{col}"' for col in columns)
+    conflict_str = ', '.join(f'"{col}"' for col in conflict_cols)
+    update_cols = [col for col in columns if col not in conflict_cols]
+    if update_cols:
+        on_conflict = "DO UPDATE SET " + ', '.join(f'"{col}" = EXCLUDED."{col}"' for col in update_cols)
+    else:
+        on_conflict = "DO NOTHING"
+
+    values_str = _values_placeholders(len(columns), n_rows)
+    query_str = f'INSERT INTO "{schema}"."{table_name}" ({columns_str}) VALUES {values_str}'
+    if conflict_cols:
+        query_str += f' ON CONFLICT ({conflict_str}) {on_conflict}'
+    return text(query_str)
+
+
+@lru_cache(maxsize=512)
+def _update_statement(
+    schema: str,
+    table_name: str,
+    set_cols: Tuple[str, ...],
+    condition_cols: Tuple[str, ...]
+) -> TextClause:
+    set_str = ', '.join(f'"{col}" = :{col}' for col in set_cols)
+    where_str = ' AND '.join(f'"{col}" = :{col}' for col in condition_cols)
+    return text(f'UPDATE "{schema}"."{table_name}" SET {set_str} WHERE {where_str}')
+
+
+@lru_cache(maxsize=512)
+def _staging_statements(
+    schema: str,
+    table_name: str,
+    staging: str,
+    set_cols: Tuple[str, ...],
+    condition_cols: Tuple[str, ...]
+) -> Tuple[TextClause, TextClause]:
+    """
+    CREATE for a temp staging table typed like the target columns, and the
+    UPDATE ... FROM that applies it. The staging table is dropped on commit.
+    """
+    columns_str = ', '.join(f'"{col}"' for col in condition_cols + set_cols)
+    create_stmt = text(
+        f'CREATE TEMP TABLE "{staging}" ON COMMIT DROP AS '
+        f'SELECT {columns_str} FROM "{schema}"."{table_name}" WITH NO DATA'
+    )
+
+    set_str = ', '.join(f'"{col}" = s."{col}"' for col in set_cols)
+    where_str = ' AND '.join(f't."{col}" = s."{col}"' for col in condition_cols)
+    update_stmt = text(
+        f'UPDATE "{schema}"."{table_name}" AS t SET {set_str} '
+        f'FROM "{staging}" AS s WHERE {where_str}'
+    )
+    return create_stmt, update_stmt
+
+
+@lru_cache(maxsize=512)
+def _staging_insert_statement(staging: str, columns: Tuple[str, ...], n_rows: int) -> TextClause:
+    columns_str = ', '.join(f'"{col}"' for col in columns)
+    return text(
+        f'INSERT INTO "{staging}" ({columns_str}) '
+        f'VALUES {_values_placeholders(len(columns), n_rows)}'
+    )
+
+
+@lru_cache(maxsize=128)
+def _delete_statement(schema: str, table_name: str, key_col: str) -> TextClause:
+    return text(
+        f'DELETE FROM "{schema}"."{table_name}" WHERE "{key_col}" IN :keys'
+    ).bindparams(bindparam("keys", expanding=True))
+
+
+# ====== READ-THROUGH TABLE CACHE ======
+_read_cache = TTLCache(
+    maxsize=settings.database.READ_CACHE_MAXSIZE,
+    ttl=settings.database.READ_CACHE_TTL
+)
+_cached_tables = frozenset(settings.database.READ_CACHE_TABLES)
+_MISS = object()
+_write_hooks: Dict[Tuple[str, str], List[Callable[[str, str], None]]] = {}
+
+
+def _read_cache_key(
+    kind: str,
+    schema: str,
+    table_name: str,
+    spec: Tuple[Tuple[str, str], ...] = (),
+    params: Optional[Dict[str, Any]] = None,
+    columns: Optional[Tuple[str, ...]] = None
+):
+    """Cache key for a read, or None if the table is not cached or the params are unhashable."""
+    if f"{schema}.{table_name}" not in _cached_tables:
+        return None
+
+    frozen = tuple(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in (params or {}).items()
+    )
+    key = (kind, schema, table_name, spec, frozen, columns)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _read_cache_get(key):
+    if key is None:
+        return _MISS
+    rows = _read_cache.get(key, _MISS)
+    if rows is _MISS or rows is None:
+        return rows
+    # Hand out copies so callers can't mutate the cached rows
+    return [dict(row) for row in rows]
+
+
+def _read_cache_put(key, rows, snapshot) -> None:
+    if key is None:
+        return
+    value = None if rows is None else [dict(row) for row in rows]
+    _read_cache.set(key, value, tags=((key[1], key[2]),), snapshot=snapshot)
+
+
+def _read_cache_snapshot(key):
+    return _read_cache.snapshot(((key[1], key[2]),)) if key is not None else None
+
+
+def invalidate_table_cache(schema: str, table_name: str) -> None:
+    """
+    Drop every cached read of a table and run its write hooks.
+    Called by the write helpers after commit.
+    """
+    tag = (_identifier(schema), _identifier(table_name))
+    _read_cache.invalidate_tag(tag)
+    for hook in _write_hooks.get(tag, ()):
+        try:
+            hook(*tag)
+        except Exception as e:
+            print(f"⚠️ Write hook for {tag[0]}.{tag[1]} failed: {e}")
+
+
+def register_write_hook(schema: str, table_name: str, hook: Callable[[str, str], None]) -> None:
+    """
+    Call hook(schema, table_name) whenever the write helpers change that table,
+    so caches derived from it outside this module can be dropped too.
+    """
+    _write_hooks.setdefault((_identifier(schema), _identifier(table_name)), []).append(hook)
+
+
+def get_read_cache_stats() -> Dict[str, Any]:
+    stats = _read_cache.stats()
+    stats["tables"] = sorted(_cached_tables)
+    return stats
+
+
+@lru_cache(maxsize=256)
+def _query_statement(sql: str) -> TextClause:
+    return text(sql)
+
 
-        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-
-        @contextmanager
-        def get_db():
-            db_session = SessionLocal()
-            try:
-                if schema:
-                    db_session.execute(text(f'SET search_path TO "{schema}"'))
-                yield db_session
-            finally:
-                db_session.close()
-
-        with get_db() as session:
-            check_query = text("""
-                SELECT tablename 
-                FROM pg_tables 
-                WHERE schemaname = :schema AND tablename = :table_name
-            """)
-            exists = session.execute(check_query, {"schema": schema, "table_name": table_name}).fetchone()
-
-            if not exists:
+def _query_cache_key(sql: str, params: Dict[str, Any], tables: Tuple[Tuple[str, str], ...]):
+    """Cache key for a raw query, or None unless every table it reads is a cached table."""
+    if not tables or any(f"{schema}.{table}" not in _cached_tables for schema, table in tables):
+        return None
+
+    key = ("query", sql, tuple(sorted(params.items())), tables)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def run_query(
+    sql: str,
+    params: Optional[Dict[str, Any]] = None,
+    tables: Optional[List[Tuple[str, str]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run a read-only statement (e.g. a JOIN) with bound parameters.
+    `tables` lists the (schema, table) pairs it reads; when all of them are cached
+    tables the result goes through the read cache and is dropped by writes to any of them.
+    """
+    params = params or {}
+    tags = tuple((_identifier(schema), _identifier(table)) for schema, table in (tables or []))
+
+    cache_key = _query_cache_key(sql, params, tags)
+    if cache_key is not None:
+        cached = _read_cache.get(cache_key, _MISS)
+        if cached is not _MISS:
+            return [dict(row) for row in cached]
+        snapshot = _read_cache.snapshot(tags)
+
+    with get_db() as session:
+        result = session.execute(_query_statement(sql), params)
+        columns = result.keys()
+        rows = [dict(zip(columns, row)) for row in result.fetchall()]
+
+    if cache_key is not None:
+        _read_cache.set(cache_key, [dict(row) for row in rows], tags=tags, snapshot=snapshot)
+    return rows
+
+
+def get_data(
+    schema: str,
+    table_name: str,
+    columns: Optional[List[str]] = None
+) -> Optional[List[Dict[str, Any]]]:
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
+    projection = _projection(columns)
+
+    cache_key = _read_cache_key("data", schema, table_name, columns=projection)
+    cached = _read_cache_get(cache_key)
+    if cached is not _MISS:
+        return cached
+    snapshot = _read_cache_snapshot(cache_key)
+
+    try:
+        with get_db(schema) as session:
+            if _load_table_metadata(schema, table_name, session)[1] is None:
+                _read_cache_put(cache_key, None, snapshot)
                 return None
 
-            data_query = text(f'SELECT * FROM "{schema}"."{table_name}"')
+            data_query = _select_statement(schema, table_name, (), False, projection)
             result = session.execute(data_query)
             columns = result.keys()
             data = [dict(zip(columns, row)) for row in result.fetchall()]
+            _read_cache_put(cache_key, data, snapshot)
             return data
 
     except Exception as e:
         raise
 
 
+def get_where(
+    schema: str,
+    table_name: str,
+    filters: Dict[Any, Any],
+    limit: Optional[int] = None,
+    columns: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch the rows matching every column = value pair in `filters`.
+    The predicate runs in Postgres with bound parameters; pass `columns`
+    to select only those columns instead of *.
+    """
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
+    spec, params = _filter_spec(filters)
+    if limit is not None:
+        params["_limit"] = int(limit)
+    projection = _projection(columns)
+
+    cache_key = _read_cache_key("where", schema, table_name, spec, params, projection)
+    cached = _read_cache_get(cache_key)
+    if cached is not _MISS:
+        return cached
+    snapshot = _read_cache_snapshot(cache_key)
+
+    query = _select_statement(schema, table_name, spec, limit is not None, projection)
+
+    with get_db(schema) as session:
+        result = session.execute(query, params)
+        columns = result.keys()
+        rows = [dict(zip(columns, row)) for row in result.fetchall()]
+
+    _read_cache_put(cache_key, rows, snapshot)
+    return rows
+
+
+def get_by_key(
+    schema: str,
+    table_name: str,
+    key_col: str,
+    key_value: Any,
+    columns: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a single row by key column, or None if there is no match.
+    """
+    rows = get_where(schema, table_name, {key_col: key_value}, limit=1, columns=columns)
+    return rows[0] if rows else None
+
+
+def stream_data(
+    schema: str,
+    table_name: str,
+    filters: Optional[Dict[Any, Any]] = None,
+    chunk_size: Optional[int] = None,
+    columns: Optional[List[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield rows one at a time from a server-side cursor, `chunk_size` rows per fetch,
+    so large tables can be processed in constant memory.
+    The pooled connection is held until the generator is exhausted or closed.
+    """
+    chunk_size = chunk_size or settings.database.STREAM_CHUNK_SIZE
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
+    spec, params = _filter_spec(filters or {})
+
+    query = _select_statement(schema, table_name, spec, False, _projection(columns))
+
+    with get_db(schema) as session:
+        result = session.execute(query, params, execution_options={"yield_per": chunk_size})
+        for partition in result.mappings().partitions():
+            for row in partition:
+                yield dict(row)
+
+
 def connect_milvus(alias: str = "default"):
-    milvus_settings = Settings().milvus
-    try:
-        connections.connect(
-            alias=alias,
-            host=milvus_settings.HOST,
-            port=milvus_settings.PORT,
+    """Open the process-wide Milvus connection for `alias` if it is not open yet."""
+    from database.milvus import get_milvus_manager
+
+    get_milvus_manager(alias).connect()
+
+
+
+# Postgres caps a single statement at 65535 bind parameters.
+MAX_BIND_PARAMS = 65535
+
+
+def _write_stats(rows: int, batches: int, started: float) -> Dict[str, Any]:
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "batches": batches,
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": round(rows / elapsed, 2) if elapsed > 0 else float(rows),
+    }
+
+
+def _bulk_upsert(
+    session,
+    schema: str,
+    table_name: str,
+    columns: List[str],
+    rows: List[Dict[str, Any]],
+    conflict_cols: List[str],
+    batch_size: int
+) -> Dict[str, Any]:
+    """
+    Send rows as multi-row INSERT ... ON CONFLICT statements, `batch_size` rows per round trip.
+    Rows repeating a conflict key are collapsed first (last one wins), since a single
+    statement cannot touch the same target row twice. Every row must set the same
+    columns, conflict columns included; with no conflict columns rows are plain INSERTs.
+    """
+    started = time.perf_counter()
+    columns = [_identifier(col) for col in columns]
+    _require_same_columns(columns, rows)
+
+    missing = [col for col in conflict_cols if col not in columns]
+    if missing:
+        raise ValueError(
+            f"Conflict columns {missing} are not set by the rows written to {schema}.{table_name}, "
+            f"so rows repeating a key cannot be collapsed"
         )
-    except Exception as e:
-        raise
+    if conflict_cols:
+        rows = list({tuple(row[col] for col in conflict_cols): row for row in rows}.values())
+
+    batch_size = max(1, min(batch_size, MAX_BIND_PARAMS // len(columns)))
+
+    batches = 0
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        params = _values_params(columns, chunk)
+        stmt = _upsert_statement(schema, table_name, tuple(columns), tuple(conflict_cols), len(chunk))
+        session.execute(stmt, params)
+        batches += 1
 
+    return _write_stats(len(rows), batches, started)
 
 
-def insert_data(data: List[Dict[str, Any]], schema: str, table_name: str) -> None:
+def insert_data(
+    data: List[Dict[str, Any]],
+    schema: str,
+    table_name: str,
+    batch_size: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
     if not data:
-        return
+        return None
 
-    db_settings = settings.database
-    db_url = (
-        f"postgresql+psycopg2://{db_settings.USER}:{db_settings.PASSWORD}"
-        f"@{db_settings.ENDPOINT}:{db_settings.PORT}/{db_settings.DATABASE}"
-    )
+    batch_size = batch_size or settings.database.BULK_BATCH_SIZE
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
 
     try:
-        engine = create_engine(
-            db_url,
-            pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=5,
-            connect_args={"sslmode": "require"},
-            echo=False
-        )
-        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-
-        @contextmanager
-        def get_db():
-            db_session = SessionLocal()
-            try:
-                if schema:
-                    db_session.execute(text(f'SET search_path TO "{schema}"'))
-                yield db_session
-            finally:
-                db_session.close()
-
-        with get_db() as session:
-            col_query = text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_schema = :schema AND table_name = :table
-            """)
-            actual_columns = {row[0] for row in session.execute(col_query, {"schema": schema, "table": table_name})}
+        with get_db(schema) as session:
+            actual_columns = _load_table_metadata(schema, table_name, session)[2]
 
             if not actual_columns:
-                return
+                return None
 
             filtered_data = [
                 {k: v for k, v in row.items() if k in actual_columns}
@@ -121,148 +735,203 @@ def insert_data(data: List[Dict[str, Any]], schema: str, table_name: str) -> Non
             ]
 
             if not filtered_data or not filtered_data[0]:
-                return
+                return None
 
             columns = list(filtered_data[0].keys())
-            columns_str = ', '.join(f'"{col}"' for col in columns)
-            placeholders = ', '.join([f':{col}' for col in columns])
-
-            update_str = ', '.join([f'"{col}" = EXCLUDED."{col}"' for col in columns if col != 'id'])
-
-            insert_stmt = text(
-                f'''
-                INSERT INTO "{schema}"."{table_name}" ({columns_str})
-                VALUES ({placeholders})
-                ON CONFLICT ("id") DO UPDATE SET {update_str}
-                '''
-            )
-
-            for item in filtered_data:
-                session.execute(insert_stmt, item)
+            # Rows without an id get a generated one and cannot conflict
+            conflict_cols = ["id"] if "id" in columns else []
+            stats = _bulk_upsert(session, schema, table_name, columns, filtered_data, conflict_cols, batch_size)
 
             session.commit()
-            print("✅ Insert / Update completed successfully.")
+            invalidate_table_cache(schema, table_name)
+            print(f"✅ Insert / Update completed successfully: {stats['rows']} rows in "
+                  f"{stats['batches']} batches ({stats['rows_per_sec']} rows/sec).")
+            return stats
 
     except Exception as e:
         print(f"Error inserting data: {e}")
         raise
 
 
-def upsert_data(data: List[Dict[str, Any]], schema: str, table_name: str, conflict_cols: List[str]) -> None:
+def upsert_data(
+    data: List[Dict[str, Any]],
+    schema: str,
+    table_name: str,
+    conflict_cols: List[str],
+    batch_size: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
     if not data:
-        return
+        return None
 
-    db_settings = settings.database
-    db_url = (
-        f"postgresql+psycopg2://{db_settings.USER}:{db_settings.PASSWORD}"
-        f"@{db_settings.ENDPOINT}:{db_settings.PORT}/{db_settings.DATABASE}"
-    )
+    batch_size = batch_size or settings.database.BULK_BATCH_SIZE
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
 
     try:
-        engine = create_engine(
-            db_url,
-            pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=5,
-            connect_args={"sslmode": "require"},
-            echo=False
-        )
-        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-
-        @contextmanager
-        def get_db():
-            db_session = SessionLocal()
-            try:
-                if schema:
-                    db_session.execute(text(f'SET search_path TO "{schema}"'))
-                yield db_session
-            finally:
-                db_session.close()
-
-        with get_db() as session:
-            col_query = text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_schema = :schema AND table_name = :table
-            """)
-            actual_columns = {row[0] for row in session.execute(col_query, {"schema": schema, "table": table_name})}
+        with get_db(schema) as session:
+            actual_columns = _load_table_metadata(schema, table_name, session)[2]
 
             if not actual_columns:
-                return
+                return None
             filtered_data = [
                 {k: v for k, v in row.items() if k in actual_columns}
                 for row in data
             ]
 
             if not filtered_data or not filtered_data[0]:
-                return
+                return None
 
             columns = list(filtered_data[0].keys())
-            columns_str = ', '.join(f'"{col}"' for col in columns)
-            placeholders = ', '.join([f':{col}' for col in columns])
-            conflict_str = ', '.join(f'"{col}"' for col in conflict_cols)
-            update_str = ', '.join([f'"{col}" = EXCLUDED."{col}"'
-                                    for col in columns if col not in conflict_cols])
-
-            upsert_stmt = text(
-                f'''
-                INSERT INTO "{schema}"."{table_name}" ({columns_str})
-                VALUES ({placeholders})
-                ON CONFLICT ({conflict_str}) DO UPDATE
-                SET {update_str}
-                '''
-            )
+            conflict_cols = [_identifier(col) for col in conflict_cols]
+            stats = _bulk_upsert(session, schema, table_name, columns, filtered_data, conflict_cols, batch_size)
 
-            for item in filtered_data:
-                session.execute(upsert_stmt, item)
+            session.commit()
+            invalidate_table_cache(schema, table_name)
+            return stats
+
+    except Exception as e:
+        raise
+
+
+def replace_data(
+    data: List[Dict[str, Any]],
+    schema: str,
+    table_name: str,
+    key_col: str,
+    key_values: List[Any],
+    conflict_cols: List[str],
+    batch_size: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Replace every row whose key_col is in key_values with `data`, in one
+    transaction: one DELETE, then batched multi-row inserts.
+    """
+    if not key_values:
+        return None
+
+    batch_size = batch_size or settings.database.BULK_BATCH_SIZE
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
+    key_col = _identifier(key_col)
+
+    try:
+        with get_db(schema) as session:
+            actual_columns = _load_table_metadata(schema, table_name, session)[2]
+
+            if not actual_columns:
+                return None
+
+            session.execute(_delete_statement(schema, table_name, key_col), {"keys": list(key_values)})
+
+            filtered_data = [
+                {k: v for k, v in row.items() if k in actual_columns}
+                for row in data
+            ]
+            stats = _write_stats(0, 0, time.perf_counter())
+            if filtered_data and filtered_data[0]:
+                columns = list(filtered_data[0].keys())
+                conflict_cols = [_identifier(col) for col in conflict_cols]
+                stats = _bulk_upsert(session, schema, table_name, columns, filtered_data, conflict_cols, batch_size)
 
             session.commit()
+            invalidate_table_cache(schema, table_name)
+            return stats
 
     except Exception as e:
         raise
 
 
-def update_data(data: List[Dict[str, Any]], schema: str, table_name: str, condition_cols: List[str]) -> None:
+def _bulk_update(
+    session,
+    schema: str,
+    table_name: str,
+    staging: str,
+    set_cols: Tuple[str, ...],
+    condition_cols: Tuple[str, ...],
+    rows: List[Dict[str, Any]],
+    batch_size: int
+) -> int:
+    """
+    Apply rows sharing one column shape with a single set-based UPDATE.
+    A lone row goes straight to UPDATE ... WHERE; larger sets are staged in a
+    temp table (multi-row INSERTs of `batch_size`) and joined in one UPDATE ... FROM.
+    Keys must be distinct; update_data merges rows repeating a key beforehand.
+    Returns the number of statements sent.
+    """
+    if len(rows) == 1:
+        session.execute(_update_statement(schema, table_name, set_cols, condition_cols), rows[0])
+        return 1
+
+    columns = condition_cols + set_cols
+    _require_same_columns(list(columns), rows)
+
+    batch_size = max(1, min(batch_size, MAX_BIND_PARAMS // len(columns)))
+    create_stmt, update_stmt = _staging_statements(schema, table_name, staging, set_cols, condition_cols)
+
+    session.execute(create_stmt)
+    statements = 1
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        session.execute(
+            _staging_insert_statement(staging, columns, len(chunk)),
+            _values_params(list(columns), chunk)
+        )
+        statements += 1
+    session.execute(update_stmt)
+    return statements + 1
+
+
+def _group_update_rows(
+    rows: List[Dict[str, Any]],
+    condition_cols: Tuple[str, ...]
+) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+    """
+    Merge rows repeating a key, last value winning per column, so the result
+    matches applying them row by row whatever columns each sets; then group
+    them by the (sorted) columns they set, one statement shape per group.
+    Rows setting nothing beyond the key are skipped.
+    """
+    merged: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for item in rows:
+        item = {_identifier(col): value for col, value in item.items()}
+        missing = [col for col in condition_cols if col not in item]
+        if missing:
+            raise ValueError(f"Row is missing condition columns {missing}: {item}")
+        merged.setdefault(tuple(item[col] for col in condition_cols), {}).update(item)
+
+    shapes: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for item in merged.values():
+        set_cols = tuple(sorted(col for col in item.keys() if col not in condition_cols))
+
+        if not set_cols:
+            continue
+
+        shapes.setdefault(set_cols, []).append(item)
+    return shapes
+
+
+def update_data(
+    data: List[Dict[str, Any]],
+    schema: str,
+    table_name: str,
+    condition_cols: List[str],
+    batch_size: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
     if not data:
-        return
+        return None
 
-    db_settings = settings.database
-    db_url = (
-        f"postgresql+psycopg2://{db_settings.USER}:{db_settings.PASSWORD}"
-        f"@{db_settings.ENDPOINT}:{db_settings.PORT}/{db_settings.DATABASE}"
-    )
+    batch_size = batch_size or settings.database.BULK_BATCH_SIZE
+    schema = _identifier(schema)
+    table_name = _identifier(table_name)
+    condition_cols = tuple(_identifier(col) for col in condition_cols)
 
     try:
-        engine = create_engine(
-            db_url,
-            pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=5,
-            connect_args={"sslmode": "require"},
-            echo=False
-        )
-        SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-
-        @contextmanager
-        def get_db():
-            db_session = SessionLocal()
-            try:
-                if schema:
-                    db_session.execute(text(f'SET search_path TO "{schema}"'))
-                yield db_session
-            finally:
-                db_session.close()
-
-        with get_db() as session:
-            col_query = text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_schema = :schema AND table_name = :table
-            """)
-            actual_columns = {row[0] for row in session.execute(col_query, {"schema": schema, "table": table_name})}
+        with get_db(schema) as session:
+            started = time.perf_counter()
+            actual_columns = _load_table_metadata(schema, table_name, session)[2]
 
             if not actual_columns:
-                return
+                return None
 
             filtered_data = [
                 {k: v for k, v in row.items() if k in actual_columns}
@@ -270,21 +939,22 @@ def update_data(data: List[Dict[str, Any]], schema: str, table_name: str, condit
             ]
 
             if not filtered_data or not filtered_data[0]:
-                return
-
-            for item in filtered_data:
-                set_str = ', '.join([f'"{col}" = :{col}' for col in item.keys() if col not in condition_cols])
-                where_str = ' AND '.join([f'"{col}" = :{col}' for col in condition_cols])
+                return None
 
-                if not set_str:
-                    continue
+            shapes = _group_update_rows(filtered_data, condition_cols)
 
-                update_stmt = text(
-                    f'UPDATE "{schema}"."{table_name}" SET {set_str} WHERE {where_str}'
+            statements = 0
+            rows = 0
+            for idx, (set_cols, items) in enumerate(shapes.items()):
+                staging = f"_stage_{table_name}_{idx}"
+                statements += _bulk_update(
+                    session, schema, table_name, staging, set_cols, condition_cols, items, batch_size
                 )
-                session.execute(update_stmt, item)
+                rows += len(items)
 
             session.commit()
+            invalidate_table_cache(schema, table_name)
+            return _write_stats(rows, statements, started)
 
     except Exception as e:
         raise
@@ -294,36 +964,6 @@ def insert_employee_courses(data: List[Dict[str, Any]]) -> None:
         print("No data to insert.")
         return
 
-    # Database settings
-    db_settings = settings.database
-    db_url = (
-        f"postgresql+psycopg2://{db_settings.USER}:{db_settings.PASSWORD}"
-        f"@{db_settings.ENDPOINT}:{db_settings.PORT}/{db_settings.DATABASE}"
-    )
-
-    engine = create_engine(
-        db_url,
-        pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=5,
-        connect_args={"sslmode": "require"},
-        echo=False
-    )
-    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-
-    @contextmanager
-    def get_db():
-        db_session = SessionLocal()
-        try:
-            # Set schema
-            if EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value:
-                db_session.execute(
-                    text(f'SET search_path TO "{EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value}"')
-                )
-            yield db_session
-        finally:
-            db_session.close()
-
     # Câu lệnh INSERT / UPDATE theo employee_id
     columns = [
         EmployeeCourse.EMPLOYEE_ID.value,
@@ -336,7 +976,7 @@ def insert_employee_courses(data: List[Dict[str, Any]]) -> None:
 
     insert_stmt = text(
         f'''
-        INSERT INTO "{EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value}"."{EmployeeCourse.EMPLOYEE_COURSE_TABLE.value}" 
+        INSERT INTO "{EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value}"."{EmployeeCourse.EMPLOYEE_COURSE_TABLE.value}"
         ({columns_str})
         VALUES ({placeholders})
         ON CONFLICT ("{EmployeeCourse.EMPLOYEE_ID.value}") DO UPDATE SET {update_str}
@@ -344,10 +984,14 @@ def insert_employee_courses(data: List[Dict[str, Any]]) -> None:
     )
 
     try:
-        with get_db() as session:
+        with get_db(EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value) as session:
             # Batch insert
             session.execute(insert_stmt, data)
             session.commit()
+            invalidate_table_cache(
+                EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value,
+                EmployeeCourse.EMPLOYEE_COURSE_TABLE.value
+            )
             print(f"✅ Inserted / updated {len(data)} records into "
                   f"{EmployeeCourse.EMPLOYEE_COURSE_DATABASE.value}."
                   f"{EmployeeCourse.EMPLOYEE_COURSE_TABLE.value}")
@@ -355,14 +999,12 @@ def insert_employee_courses(data: List[Dict[str, Any]]) -> None:
         print(f"Error inserting data: {e}")
         raise
 
-from typing import List, Dict, Any
-import numpy as np
-from pymilvus import Collection
-from database.session import connect_milvus
 from database.db import COURSERAMilvusFields
 
 def cosine_similarity(v1: List[float], v2: List[float]) -> float:
     """Tính cosine similarity giữa hai vector."""
+    import numpy as np
+
     v1 = np.array(v1)
     v2 = np.array(v2)
     if np.linalg.norm(v1) == 0 or np.linalg.norm(v2) == 0:
@@ -374,10 +1016,10 @@ def get_vectors_by_course(collection_name: str, skill: str) -> List[Dict[str, An
     Lấy tất cả vector (và thông tin khác) của một course cụ thể từ Milvus.
     Đồng thời in cosine similarity giữa các vector.
     """
-    connect_milvus()
+    from database.milvus import get_milvus_manager
+
     try:
-        collection = Collection(collection_name)
-        collection.load()
+        collection = get_milvus_manager().get_collection(collection_name)
 
         # Lấy tất cả field, bao gồm vector
         all_fields = [field.name for field in collection.schema.fields]
@@ -412,17 +1054,10 @@ def get_vectors_by_course(collection_name: str, skill: str) -> List[Dict[str, An
         print(f"Error fetching vectors for course '{skill}': {e}")
         return []
 
-from typing import List, Dict
-from pymilvus import Collection
-from database.db import COURSERAMilvusFields
-from database.session import connect_milvus
-import numpy as np
-
-# Giả sử embed_skills đã được import từ file embedding bạn đưa ở trên
-from apps.recommendation.embedding import embed_skills
-
 def cosine_similarity(vec1, vec2):
     """Tính cosine similarity giữa 2 vector."""
+    import numpy as np
+
     v1 = np.array(vec1)
     v2 = np.array(vec2)
     return np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
@@ -437,7 +1072,9 @@ def search_courses_by_text(
     """
     Embed text -> tìm trong Milvus -> in khóa học có similarity >= threshold.
     """
-    connect_milvus()
+    from database.milvus import get_milvus_manager
+    # Giả sử embed_skills đã được import từ file embedding bạn đưa ở trên
+    from apps.recommendation.embedding import embed_skills
 
     try:
         # 1. Embed text
@@ -448,8 +1085,7 @@ def search_courses_by_text(
             return []
 
         # 2. Kết nối collection
-        collection = Collection(collection_name)
-        collection.load()
+        collection = get_milvus_manager().get_collection(collection_name)
 
         # 3. Tìm kiếm vector trong Milvus
         search_params = {"metric_type": "COSINE", "params": {"nprobe": 10}}
@@ -1,5 +1,7 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.routing import Match
 from api.auth import router as auth_router
 from api.recommendation import router as ai_router
 from api.learning_dashboard import router as dashboard_router
@@ -7,6 +9,18 @@ from api.goal import router as goal_router
 from api.external_courses import router as external_courses_router
 from api.skills_mapping import router as skills_router
 from api.feedback import router as feedback_router
+from api.metrics import router as metrics_router
+from api.health import router as health_router
+from core.health import health_monitor
+from apps.recommendation.jobs import shutdown_job_manager
+from core.metrics import (
+    registry, HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT, start_request, finish_request
+)
+from database.session import dispose_engine, get_pool_stats, get_read_cache_stats
+from database.async_session import dispose_async_engine, get_async_pool_stats
+from database.milvus import close_milvus, get_milvus_stats
+from access_control.password import password_verifier, get_login_stats
+from access_control.auth import get_token_cache_stats
 
 app = FastAPI()
 
@@ -19,11 +33,60 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics
+def _route_template(request: Request) -> str:
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return "unmatched"
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    method = request.method
+    route = _route_template(request)
+    HTTP_IN_FLIGHT.inc(method=method, route=route)
+    tally, token = start_request()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=route)
+        HTTP_REQUESTS.inc(method=method, route=route, status=status)
+        HTTP_IN_FLIGHT.dec(method=method, route=route)
+        finish_request(tally, token, route)
+
+registry.register_collector("db_pool", get_pool_stats)
+registry.register_collector("db_async_pool", get_async_pool_stats)
+registry.register_collector("read_cache", get_read_cache_stats)
+registry.register_collector("token_cache", get_token_cache_stats)
+registry.register_collector("login", get_login_stats)
+registry.register_collector("milvus", get_milvus_stats)
+
 # Root
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "Welcome to Pathwise API"}
 
+# Startup
+@app.on_event("startup")
+async def start_health_probes():
+    health_monitor.start()
+
+# Shutdown
+@app.on_event("shutdown")
+async def close_db_pool():
+    await health_monitor.stop()
+    print(f"Closing DB pools: sync={get_pool_stats()} async={get_async_pool_stats()}")
+    dispose_engine()
+    await dispose_async_engine()
+    password_verifier.shutdown()
+    shutdown_job_manager()
+    close_milvus()
+
 # Routers
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(ai_router, prefix="/ai", tags=["AI Recommendation"])
@@ -32,3 +95,5 @@ app.include_router(goal_router, prefix="/goal", tags=["Goal"])
 app.include_router(external_courses_router, tags=["External Courses"])
 app.include_router(skills_router, tags=["Skills Mapping"])
 app.include_router(feedback_router, tags=["Feedback"])
+app.include_router(metrics_router, tags=["Metrics"])
+app.include_router(health_router, tags=["Health"])
@@ -1,5 +1,6 @@
+from enum import Enum
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 
 class UserProfile(BaseModel):
     user_id: str
@@ -7,3 +8,41 @@ class UserProfile(BaseModel):
 
 class CourseRecommendation(BaseModel):
     courses: List[str]
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class RecommendationJob(BaseModel):
+    job_id: str
+    user_id: str
+    status: JobStatus
+    update: bool = False
+    stage: Optional[str] = None
+    progress: float = 0.0
+    result: Optional[CourseRecommendation] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+class RecommendationJobAccepted(BaseModel):
+    job_id: str
+    status: JobStatus
+    status_url: str
+
+class BatchRecommendationRequest(BaseModel):
+    department_id: Optional[str] = None
+    employee_ids: Optional[List[str]] = None
+    all_employees: bool = False
+
+class BatchRecommendationStatus(BaseModel):
+    batch_id: str
+    status: JobStatus
+    department_id: Optional[str] = None
+    employee_ids: Optional[List[str]] = None
+    summary: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
@@ -0,0 +1,19 @@
+import os
+
+# core.config builds every settings group at import time; give the required
+# ones placeholder values so pure-logic modules can be imported without a .env.
+for name, value in {
+    "URI_COURSERA": "http://localhost",
+    "GEN_KEY_GEN_1": "test",
+    "EM_KEY_EMBEDDING_1": "test",
+    "EM_KEY_EMBEDDING_2": "test",
+    "EM_KEY_EMBEDDING_3": "test",
+    "EM_KEY_EMBEDDING_4": "test",
+    "RDS_ENDPOINT": "localhost",
+    "RDS_USER": "test",
+    "RDS_PASSWORD": "test",
+    "RDS_DATABASE": "test",
+    "MIL_HOST": "localhost",
+    "MIL_PORT": "19530",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,75 @@
+import time
+from core.cache import TTLCache
+
+
+def test_get_returns_stored_value_until_ttl():
+    cache = TTLCache(maxsize=10, ttl=0.05)
+    cache.set("k", 1)
+    assert cache.get("k") == 1
+    time.sleep(0.06)
+    assert cache.get("k", "miss") == "miss"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_tag_drops_tagged_entries_only():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("x", 1, tags=("t1",))
+    cache.set("y", 2, tags=("t1", "t2"))
+    cache.set("z", 3, tags=("t2",))
+    cache.invalidate_tag("t1")
+    assert cache.get("x") is None
+    assert cache.get("y") is None
+    assert cache.get("z") == 3
+
+
+def test_set_with_stale_snapshot_is_rejected():
+    # A read that started before a write must not re-populate the old value
+    cache = TTLCache(maxsize=10, ttl=60)
+    snapshot = cache.snapshot(("t",))
+    cache.invalidate_tag("t")
+    assert cache.set("k", "stale", tags=("t",), snapshot=snapshot) is False
+    assert cache.get("k") is None
+
+    fresh = cache.snapshot(("t",))
+    assert cache.set("k", "fresh", tags=("t",), snapshot=fresh) is True
+    assert cache.get("k") == "fresh"
+
+
+def test_snapshot_of_unrelated_tag_is_unaffected():
+    cache = TTLCache(maxsize=10, ttl=60)
+    snapshot = cache.snapshot(("a",))
+    cache.invalidate_tag("b")
+    assert cache.set("k", 1, tags=("a",), snapshot=snapshot) is True
+
+
+def test_clear_invalidates_outstanding_snapshots():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("k", 1, tags=("t",))
+    snapshot = cache.snapshot(("t",))
+    cache.clear()
+    assert cache.set("k", 2, tags=("t",), snapshot=snapshot) is False
+
+
+def test_retagging_a_key_drops_old_tag_membership():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("k", 1, tags=("old",))
+    cache.set("k", 2, tags=("new",))
+    cache.invalidate_tag("old")
+    assert cache.get("k") == 2
+
+
+def test_zero_ttl_is_not_stored():
+    cache = TTLCache(maxsize=10, ttl=0)
+    assert cache.set("k", 1) is False
+    assert cache.get("k") is None
@@ -0,0 +1,86 @@
+import random
+from itertools import combinations
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pydantic_settings")
+
+from apps.recommendation.set_cover import solve_set_cover
+
+
+def _covered(coverage, selected):
+    return set().union(*(coverage[c] for c in selected)) if selected else set()
+
+
+def _optimum(coverage, coverable):
+    for k in range(len(coverage) + 1):
+        for combo in combinations(coverage, k):
+            if _covered(coverage, combo) >= coverable:
+                return k
+
+
+def _random_instance(rng, n_skills, n_courses, max_size):
+    skills = [f"s{i}" for i in range(n_skills)]
+    coverage = {
+        f"c{j}": set(rng.sample(skills, rng.randint(1, min(max_size, n_skills))))
+        for j in range(n_courses)
+    }
+    return skills, coverage
+
+
+def test_matches_brute_force_optimum():
+    pytest.importorskip("ortools")
+    rng = random.Random(7)
+    solvers = set()
+    for _ in range(300):
+        skills, coverage = _random_instance(rng, rng.randint(1, 10), rng.randint(1, 12), 4)
+        priority = {c: rng.random() for c in coverage}
+        result = solve_set_cover(skills, coverage, priority, time_limit=10, workers=1)
+
+        coverable = set().union(*coverage.values())
+        best = _optimum(coverage, coverable)
+        assert _covered(coverage, result["selected"]) >= coverable
+        assert len(result["selected"]) == best
+        assert result["optimal"]
+        assert result["lower_bound"] <= best
+        solvers.add(result["solver"])
+    # Both the proven-greedy early return and the CP-SAT path were exercised
+    assert solvers == {"greedy", "cp_sat"}
+
+
+def test_greedy_early_return_is_truly_optimal():
+    rng = random.Random(11)
+    for _ in range(300):
+        skills, coverage = _random_instance(rng, rng.randint(1, 7), rng.randint(1, 9), 7)
+        result = solve_set_cover(skills, coverage, time_limit=10, workers=1)
+        if result["solver"] != "greedy":
+            continue
+        coverable = set().union(*coverage.values())
+        assert result["lower_bound"] == len(result["selected"])
+        assert len(result["selected"]) == _optimum(coverage, coverable)
+
+
+def test_identical_coverage_keeps_highest_priority_course():
+    coverage = {"low": {"a", "b"}, "high": {"a", "b"}, "mid": {"b", "a"}}
+    result = solve_set_cover(["a", "b"], coverage, {"low": 0.1, "high": 0.9, "mid": 0.5})
+    assert result["selected"] == ["high"]
+    assert result["reduced"] == 0
+
+
+def test_dominated_course_is_never_selected():
+    coverage = {"small": {"a"}, "big": {"a", "b"}, "other": {"c"}}
+    result = solve_set_cover(["a", "b", "c"], coverage, {"small": 1.0, "big": 0.1})
+    assert sorted(result["selected"]) == ["big", "other"]
+
+
+def test_skills_without_courses_are_ignored():
+    result = solve_set_cover(["a", "missing"], {"c1": {"a"}, "c2": {"a", "unrequested"}})
+    assert len(result["selected"]) == 1
+    assert result["optimal"]
+
+
+def test_no_candidates():
+    result = solve_set_cover(["a"], {})
+    assert result["selected"] == []
+    assert result["optimal"]
@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from database.session import _group_update_rows
+
+
+def _final_rows(shapes):
+    return {row["id"]: row for rows in shapes.values() for row in rows}
+
+
+def _row_by_row(rows):
+    # What applying each row as its own UPDATE leaves behind
+    table = {}
+    for row in rows:
+        table.setdefault(row["id"], {}).update(row)
+    return table
+
+
+def test_repeated_key_across_shapes_keeps_last_value_per_column():
+    rows = [{"id": 1, "x": 1}, {"id": 1, "x": 2, "y": 5}, {"id": 1, "x": 3}]
+    shapes = _group_update_rows(rows, ("id",))
+    assert shapes == {("x", "y"): [{"id": 1, "x": 3, "y": 5}]}
+    assert _final_rows(shapes) == _row_by_row(rows)
+
+
+def test_each_key_appears_in_one_group_only():
+    rows = [
+        {"id": 1, "x": 1},
+        {"id": 2, "y": 2},
+        {"id": 1, "y": 3},
+        {"id": 3, "x": 4},
+        {"id": 2, "y": 5},
+    ]
+    shapes = _group_update_rows(rows, ("id",))
+    ids = [row["id"] for group in shapes.values() for row in group]
+    assert sorted(ids) == [1, 2, 3]
+    assert _final_rows(shapes) == _row_by_row(rows)
+
+
+def test_column_order_does_not_split_shapes():
+    shapes = _group_update_rows([{"id": 1, "a": 1, "b": 2}, {"id": 2, "b": 3, "a": 4}], ("id",))
+    assert list(shapes) == [("a", "b")]
+    assert len(shapes[("a", "b")]) == 2
+
+
+def test_composite_keys_are_merged_per_key():
+    rows = [{"k1": 1, "k2": "a", "v": 1}, {"k1": 1, "k2": "b", "v": 2}, {"k1": 1, "k2": "a", "v": 3}]
+    shapes = _group_update_rows(rows, ("k1", "k2"))
+    assert shapes == {("v",): [{"k1": 1, "k2": "a", "v": 3}, {"k1": 1, "k2": "b", "v": 2}]}
+
+
+def test_key_only_rows_are_skipped():
+    assert _group_update_rows([{"id": 1}], ("id",)) == {}
+
+
+def test_missing_condition_column_raises():
+    with pytest.raises(ValueError):
+        _group_update_rows([{"x": 1}], ("id",))